@@ -1,4 +1,14 @@
 import math
+import os
+import queue
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 class Matrix2D:
     def __init__(self):
@@ -11,7 +21,10 @@ class Matrix2D:
             self.data[i] = [float(x) for x in row]
 
     def input_from_file(self, file):
-        line = file.readline().strip().split()
+        self.input_from_line(file.readline())
+
+    def input_from_line(self, line):
+        line = line.strip().split()
         if len(line) == 4:
             self.data[0] = [float(line[0]), float(line[1])]
             self.data[1] = [float(line[2]), float(line[3])]
@@ -21,8 +34,10 @@ class Matrix2D:
             print(" ".join(map(str, row)))
 
     def print_to_file(self, file):
-        for row in self.data:
-            file.write(" ".join(map(str, row)) + "\n")
+        file.write(self.to_text())
+
+    def to_text(self):
+        return "".join(" ".join(map(str, row)) + "\n" for row in self.data)
 
     def determinant(self):
         return self.data[0][0] * self.data[1][1] - self.data[0][1] * self.data[1][0]
@@ -36,20 +51,71 @@ class Vector2D:
         self.y = y
 
     def input_from_file(self, file):
-        line = file.readline().strip().split()
+        self.input_from_line(file.readline())
+
+    def input_from_line(self, line):
+        line = line.strip().split()
         if len(line) == 2:
             self.x = float(line[0])
             self.y = float(line[1])
 
     def print_to_file(self, file):
-        file.write(f"x = {self.x}, y = {self.y}\n")
+        file.write(self.to_text())
+
+    def to_text(self):
+        return f"x = {self.x}, y = {self.y}\n"
+
+class MatrixCache:
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def lookup(self, matrix):
+        (a, b), (c, d) = matrix.data
+        key = (a, b, c, d)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            det = matrix.determinant()
+            degenerate = matrix.is_degenerate()
+            inverse = None if degenerate else ((d / det, -b / det), (-c / det, a / det))
+            entry = self._entries[key] = (det, degenerate, inverse)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        else:
+            self.hits += 1
+            self._entries.move_to_end(key)
+        return entry
+
+    def solve(self, matrix, vector):
+        _, degenerate, inverse = self.lookup(matrix)
+        if degenerate:
+            return Vector2D(math.nan, math.nan)
+        (i00, i01), (i10, i11) = inverse
+        return Vector2D(i00 * vector.x + i01 * vector.y, i10 * vector.x + i11 * vector.y)
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
 
 class Solver:
-    def __init__(self, matrix, vector):
+    def __init__(self, matrix, vector, cache=None):
         self.A = matrix
         self.b = vector
+        self.cache = cache
 
     def solve_cramer(self):
+        if self.cache is not None:
+            detA, degenerate, _ = self.cache.lookup(self.A)
+            if degenerate:
+                return Vector2D(math.nan, math.nan)
+            (a, b), (c, d) = self.A.data
+            return Vector2D((self.b.x * d - b * self.b.y) / detA, (a * self.b.y - self.b.x * c) / detA)
         detA = self.A.determinant()
         if self.A.is_degenerate():
             return Vector2D(math.nan, math.nan)
@@ -63,54 +129,317 @@ class Solver:
 
         return Vector2D(detX / detA, detY / detA)
 
-def main():
+    @staticmethod
+    def solve_cramer_batch(matrices, vectors):
+        if np is None:
+            raise ImportError("solve_cramer_batch requires numpy")
+        A = np.asarray(matrices, dtype=np.float64)
+        b = np.asarray(vectors, dtype=np.float64)
+        if A.ndim != 3 or A.shape[1:] != (2, 2) or b.shape != (A.shape[0], 2):
+            raise ValueError("Expected matrices of shape (N, 2, 2) and vectors of shape (N, 2)")
+        a00, a01, a10, a11 = A[:, 0, 0], A[:, 0, 1], A[:, 1, 0], A[:, 1, 1]
+        x, y = b[:, 0], b[:, 1]
+        with np.errstate(over='ignore', invalid='ignore', divide='ignore'):
+            detA = a00 * a11 - a01 * a10
+            degenerate = np.abs(detA) < 1e-10
+            safe = np.where(degenerate, 1.0, detA)
+            solutions = np.empty_like(b)
+            solutions[:, 0] = (x * a11 - a01 * y) / safe
+            solutions[:, 1] = (a00 * y - x * a10) / safe
+        solutions[degenerate] = np.nan
+        return solutions, degenerate
+
+class MatrixND:
+    def __init__(self, data):
+        self.data = [[float(x) for x in row] for row in data]
+        self.n = len(self.data)
+        if any(len(row) != self.n for row in self.data):
+            raise ValueError("MatrixND must be square")
+
+    @classmethod
+    def from_matrix2d(cls, matrix):
+        return cls(matrix.data)
+
+    def key(self):
+        return tuple(map(tuple, self.data))
+
+    def factorize(self):
+        lu = [row[:] for row in self.data]
+        perm = list(range(self.n))
+        sign = 1
+        for k in range(self.n):
+            pivot = max(range(k, self.n), key=lambda i: abs(lu[i][k]))
+            if not lu[pivot][k]:
+                continue
+            if pivot != k:
+                lu[k], lu[pivot] = lu[pivot], lu[k]
+                perm[k], perm[pivot] = perm[pivot], perm[k]
+                sign = -sign
+            row_k = lu[k]
+            for i in range(k + 1, self.n):
+                row = lu[i]
+                factor = row[k] / row_k[k]
+                row[k] = factor
+                for j in range(k + 1, self.n):
+                    row[j] -= factor * row_k[j]
+        return LUFactorization(lu, perm, sign)
+
+    def determinant(self):
+        return self.factorize().determinant()
+
+    def is_degenerate(self):
+        return self.factorize().singular
+
+class LUFactorization:
+    def __init__(self, lu, perm, sign):
+        self.lu = lu
+        self.perm = perm
+        self.sign = sign
+        self.singular = abs(self.determinant()) < 1e-10
+
+    def determinant(self):
+        det = self.sign
+        for i, row in enumerate(self.lu):
+            det *= row[i]
+        return det
+
+    def solve(self, b):
+        n = len(self.lu)
+        if self.singular:
+            return [math.nan] * n
+        y = [b[p] for p in self.perm]
+        for i in range(n):
+            row = self.lu[i]
+            y[i] -= sum(row[j] * y[j] for j in range(i))
+        x = [0.0] * n
+        for i in range(n - 1, -1, -1):
+            row = self.lu[i]
+            x[i] = (y[i] - sum(row[j] * x[j] for j in range(i + 1, n))) / row[i]
+        return x
+
+class LUSolver:
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._factorizations = OrderedDict()
+
+    def factorize(self, matrix):
+        key = matrix.key()
+        factorization = self._factorizations.get(key)
+        if factorization is None:
+            self.misses += 1
+            factorization = self._factorizations[key] = matrix.factorize()
+            if len(self._factorizations) > self.maxsize:
+                self._factorizations.popitem(last=False)
+        else:
+            self.hits += 1
+            self._factorizations.move_to_end(key)
+        return factorization
+
+    def solve(self, matrix, b):
+        return self.factorize(matrix).solve(list(b))
+
+    def solve_many(self, matrix, vectors):
+        factorization = self.factorize(matrix)
+        return [factorization.solve(list(b)) for b in vectors]
+
+class SystemCountMismatch(ValueError):
+    def __init__(self, message="Mismatch between number of matrices and RHS vectors!"):
+        super().__init__(message)
+
+def count_records(file):
+    count, last = 0, "\n"
+    for chunk in iter(lambda: file.read(1 << 20), ""):
+        count += chunk.count("\n")
+        last = chunk[-1]
+    file.seek(0)
+    return count + (last != "\n")
+
+def read_systems(matrix_file, rhs_file):
+    while True:
+        matrix_line = matrix_file.readline()
+        rhs_line = rhs_file.readline()
+        if not matrix_line or not rhs_line:
+            if matrix_line or rhs_line:
+                raise SystemCountMismatch()
+            return
+        matrix = Matrix2D()
+        matrix.input_from_line(matrix_line)
+        rhs = Vector2D()
+        rhs.input_from_line(rhs_line)
+        yield matrix, rhs
+
+def format_system(i, matrix, rhs, solution):
+    if math.isnan(solution.x):
+        result = "No unique solution (degenerate system)\n"
+    else:
+        result = solution.to_text()
+    return f"\nSystem {i}:\nMatrix:\n{matrix.to_text()}RHS: {rhs.x} {rhs.y}\nSolution: {result}"
+
+CACHE_MIN_HIT_RATE = 0.95
+
+def solve_batch(systems, cache=None, inverse=False):
+    if inverse and cache is not None:
+        return [cache.solve(matrix, rhs) for matrix, rhs in systems]
+    if np is None or cache is not None:
+        return [Solver(matrix, rhs, cache).solve_cramer() for matrix, rhs in systems]
+    solutions, _ = Solver.solve_cramer_batch([matrix.data for matrix, _ in systems],
+                                             [(rhs.x, rhs.y) for _, rhs in systems])
+    return [Vector2D(x, y) for x, y in solutions.tolist()]
+
+def solve_pipelined(matrix_file, rhs_file, output_file, cache=None, batch_size=1024, queue_size=4, inverse=False):
+    done = object()
+    batches = queue.Queue(queue_size)
+    solved = queue.Queue(queue_size)
+    stop = threading.Event()
+
+    def put(channel, item):
+        while not stop.is_set():
+            try:
+                channel.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def get(channel):
+        while not stop.is_set():
+            try:
+                return channel.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        return done
+
+    def read():
+        try:
+            batch = []
+            for system in read_systems(matrix_file, rhs_file):
+                batch.append(system)
+                if len(batch) == batch_size:
+                    if not put(batches, batch):
+                        return
+                    batch = []
+            if batch and not put(batches, batch):
+                return
+            put(batches, done)
+        except Exception as e:
+            put(batches, e)
+
+    def solve():
+        active = cache
+        warm = False
+        try:
+            while True:
+                batch = get(batches)
+                if batch is done or isinstance(batch, Exception):
+                    put(solved, batch)
+                    return
+                hits = active.hits if active is not None else 0
+                solutions = solve_batch(batch, active, inverse)
+                if active is not None and np is not None and not inverse:
+                    if warm and active.hits - hits < CACHE_MIN_HIT_RATE * len(batch):
+                        active = None
+                    warm = True
+                if not put(solved, [(matrix, rhs, solution) for (matrix, rhs), solution in zip(batch, solutions)]):
+                    return
+        except Exception as e:
+            put(solved, e)
+
+    threads = [threading.Thread(target=read, daemon=True), threading.Thread(target=solve, daemon=True)]
+    for thread in threads:
+        thread.start()
+    count = 0
     try:
+        while True:
+            batch = solved.get()
+            if batch is done:
+                break
+            if isinstance(batch, Exception):
+                raise batch
+            block = []
+            for matrix, rhs, solution in batch:
+                count += 1
+                block.append(format_system(count, matrix, rhs, solution))
+            output_file.write("".join(block))
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+    return count
+
+def record_offsets(filename, records_per_chunk):
+    offsets = [0]
+    count = 0
+    position = 0
+    with open(filename, "rb") as file:
+        for line in file:
+            position += len(line)
+            count += 1
+            if count % records_per_chunk == 0:
+                offsets.append(position)
+    return offsets, count
+
+def solve_chunk(matrix_filename, rhs_filename, matrix_offset, rhs_offset, start, count):
+    systems = []
+    with open(matrix_filename, "rb") as matrix_file, open(rhs_filename, "rb") as rhs_file:
+        matrix_file.seek(matrix_offset)
+        rhs_file.seek(rhs_offset)
+        for _ in range(count):
+            matrix = Matrix2D()
+            matrix.input_from_line(matrix_file.readline().decode())
+            rhs = Vector2D()
+            rhs.input_from_line(rhs_file.readline().decode())
+            systems.append((matrix, rhs))
+    solutions = solve_batch(systems)
+    return "".join(format_system(start + i, matrix, rhs, solution)
+                   for i, ((matrix, rhs), solution) in enumerate(zip(systems, solutions)))
+
+def solve_parallel(matrix_filename, rhs_filename, output_file, workers=None, records_per_chunk=100000):
+    matrix_offsets, count = record_offsets(matrix_filename, records_per_chunk)
+    rhs_offsets, rhs_count = record_offsets(rhs_filename, records_per_chunk)
+    if count != rhs_count:
+        raise SystemCountMismatch()
+    output_file.write(f"Solutions for {count} systems:\n")
+    with ProcessPoolExecutor(workers) as pool:
+        window = 2 * (workers or os.cpu_count() or 1)
+        pending = deque()
+        for k, start in enumerate(range(0, count, records_per_chunk)):
+            size = min(records_per_chunk, count - start)
+            pending.append(pool.submit(solve_chunk, matrix_filename, rhs_filename,
+                                       matrix_offsets[k], rhs_offsets[k], start + 1, size))
+            if len(pending) >= window:
+                output_file.write(pending.popleft().result())
+        while pending:
+            output_file.write(pending.popleft().result())
+    return count
+
+def main(workers=None, inverse=False):
+    try:
+        if workers:
+            with open("output.txt", "w") as output_file:
+                solve_parallel("matrix_coefficients.txt", "rhs_values.txt", output_file, workers)
+            print("Results written to output.txt")
+            return
+
         with open("matrix_coefficients.txt", "r") as matrix_file, \
              open("rhs_values.txt", "r") as rhs_file, \
              open("output.txt", "w") as output_file:
 
-            matrices = []
-            rhs_vectors = []
-
-            while True:
-                m = Matrix2D()
-                m.input_from_file(matrix_file)
-                if not matrix_file.tell() == matrix_file.seek(0, 2):  
-                    matrices.append(m)
-                else:
-                    break
-
-            while True:
-                v = Vector2D()
-                v.input_from_file(rhs_file)
-                if not rhs_file.tell() == rhs_file.seek(0, 2):
-                    rhs_vectors.append(v)
-                else:
-                    break
-
-            if len(matrices) != len(rhs_vectors):
+            count = count_records(matrix_file)
+            if count != count_records(rhs_file):
                 print("Mismatch between number of matrices and RHS vectors!")
                 return
 
-            output_file.write(f"Solutions for {len(matrices)} systems:\n")
-            for i, (matrix, rhs) in enumerate(zip(matrices, rhs_vectors), 1):
-                output_file.write(f"\nSystem {i}:\nMatrix:\n")
-                matrix.print_to_file(output_file)
-                output_file.write(f"RHS: {rhs.x} {rhs.y}\n")
-
-                solver = Solver(matrix, rhs)
-                solution = solver.solve_cramer()
-
-                output_file.write("Solution: ")
-                if math.isnan(solution.x):
-                    output_file.write("No unique solution (degenerate system)\n")
-                else:
-                    solution.print_to_file(output_file)
+            output_file.write(f"Solutions for {count} systems:\n")
+            solve_pipelined(matrix_file, rhs_file, output_file, MatrixCache(), inverse=inverse)
 
         print("Results written to output.txt")
 
     except FileNotFoundError:
         print("Error: One of the input files not found!")
+    except SystemCountMismatch as e:
+        print(e)
     except Exception as e:
         print(f"An error occurred: {e}")
 
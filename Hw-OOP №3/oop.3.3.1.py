@@ -1,8 +1,33 @@
+import bisect
+import heapq
+import itertools
+import json
 import math
+import mmap
+import operator
 import os
+import struct
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def dimension_field(name):
+    slot = "_" + name
+    def setter(self, value):
+        setattr(self, slot, value)
+        self.reset_metrics()
+    return property(operator.attrgetter(slot), setter)
 
 
 class Figure:
+    __slots__ = ("_perimeter", "_square", "_squareSurface", "_volume")
+    def reset_metrics(self):
+        self._perimeter = self._square = self._squareSurface = self._volume = None
     def dimension(self):
         raise NotImplementedError("Subclass must implement dimension()")
     def perimeter(self):
@@ -23,107 +48,167 @@ class Figure:
 
 
 class Triangle(Figure):
+    __slots__ = ("_a", "_b", "_c")
+    a = dimension_field("a")
+    b = dimension_field("b")
+    c = dimension_field("c")
     def __init__(self, a, b, c):
-        self.a = a
-        self.b = b
-        self.c = c
+        self._a = a
+        self._b = b
+        self._c = c
+        self._perimeter = self._square = self._squareSurface = self._volume = None
     def dimension(self):
         return 2
     def perimeter(self):
-        return self.a + self.b + self.c
+        perimeter = self._perimeter
+        if perimeter is None:
+            perimeter = self._perimeter = self._a + self._b + self._c
+        return perimeter
     def square(self):
-        if not self.is_valid_triangle():
-            return 0
-        s = self.perimeter() / 2
-        try:
-            return math.sqrt(s * (s - self.a) * (s - self.b) * (s - self.c))
-        except ValueError:
-            return 0
+        square = self._square
+        if square is None:
+            square = 0
+            if self.is_valid_triangle():
+                s = self.perimeter() / 2
+                try:
+                    square = math.sqrt(s * (s - self._a) * (s - self._b) * (s - self._c))
+                except ValueError:
+                    pass
+            self._square = square
+        return square
     def is_valid_triangle(self):
-        return (self.a + self.b > self.c and
-                self.a + self.c > self.b and
-                self.b + self.c > self.a)
+        return (self._a + self._b > self._c and
+                self._a + self._c > self._b and
+                self._b + self._c > self._a)
 
 
 class TriangularPyramid(Triangle):
+    __slots__ = ("_pyramid_height",)
+    pyramid_height = dimension_field("pyramid_height")
     def __init__(self, base_side, height):
         super().__init__(base_side, base_side, base_side)
-        self.pyramid_height = height
+        self._pyramid_height = height
     def dimension(self):
         return 3
     def squareSurface(self):
-        apothem = (self.a * math.sqrt(3)) / 6
-        slant_height = math.sqrt(self.pyramid_height ** 2 + apothem ** 2)
-        return 3 * (0.5 * self.a * slant_height)
+        surface = self._squareSurface
+        if surface is None:
+            apothem = (self._a * math.sqrt(3)) / 6
+            slant_height = math.sqrt(self._pyramid_height ** 2 + apothem ** 2)
+            surface = self._squareSurface = 3 * (0.5 * self._a * slant_height)
+        return surface
     def squareBase(self):
         return super().square()
     def height(self):
-        return self.pyramid_height
+        return self._pyramid_height
     def volume(self):
-        base_area = super().square()
-        return (base_area * self.pyramid_height) / 3
+        volume = self._volume
+        if volume is None:
+            base_area = super().square()
+            volume = self._volume = (base_area * self._pyramid_height) / 3
+        return volume
 
 
 class Rectangle(Figure):
+    __slots__ = ("_a", "_b")
+    a = dimension_field("a")
+    b = dimension_field("b")
     def __init__(self, a, b):
-        self.a = a
-        self.b = b
+        self._a = a
+        self._b = b
+        self._perimeter = self._square = self._squareSurface = self._volume = None
     def dimension(self):
         return 2
     def perimeter(self):
-        return 2 * (self.a + self.b)
+        perimeter = self._perimeter
+        if perimeter is None:
+            perimeter = self._perimeter = 2 * (self._a + self._b)
+        return perimeter
     def square(self):
-        return self.a * self.b
+        square = self._square
+        if square is None:
+            square = self._square = self._a * self._b
+        return square
 
 
 class QuadrangularPyramid(Rectangle):
+    __slots__ = ("_pyramid_height",)
+    pyramid_height = dimension_field("pyramid_height")
     def __init__(self, a, b, height):
         super().__init__(a, b)
-        self.pyramid_height = height
+        self._pyramid_height = height
     def dimension(self):
         return 3
     def squareSurface(self):
-        a, b, h = self.a, self.b, self.pyramid_height
-        slant1 = math.sqrt(h ** 2 + (b / 2) ** 2)
-        slant2 = math.sqrt(h ** 2 + (a / 2) ** 2)
-        return a * slant1 + b * slant2
+        surface = self._squareSurface
+        if surface is None:
+            a, b, h = self._a, self._b, self._pyramid_height
+            slant1 = math.sqrt(h ** 2 + (b / 2) ** 2)
+            slant2 = math.sqrt(h ** 2 + (a / 2) ** 2)
+            surface = self._squareSurface = a * slant1 + b * slant2
+        return surface
     def squareBase(self):
         return super().square()
     def height(self):
-        return self.pyramid_height
+        return self._pyramid_height
     def volume(self):
-        base_area = super().square()
-        return (base_area * self.pyramid_height) / 3
+        volume = self._volume
+        if volume is None:
+            base_area = super().square()
+            volume = self._volume = (base_area * self._pyramid_height) / 3
+        return volume
 
 
 class RectangularParallelepiped(Rectangle):
+    __slots__ = ("_c",)
+    c = dimension_field("c")
     def __init__(self, a, b, c):
         super().__init__(a, b)
-        self.c = c
+        self._c = c
     def dimension(self):
         return 3
     def squareSurface(self):
-        return 2 * (self.a * self.c + self.b * self.c)
+        surface = self._squareSurface
+        if surface is None:
+            surface = self._squareSurface = 2 * (self._a * self._c + self._b * self._c)
+        return surface
     def squareBase(self):
         return super().square()
     def height(self):
-        return self.c
+        return self._c
     def volume(self):
-        return self.a * self.b * self.c
+        volume = self._volume
+        if volume is None:
+            volume = self._volume = self._a * self._b * self._c
+        return volume
 
 
 class Trapeze(Figure):
+    __slots__ = ("_a", "_b", "_c", "_d")
+    a = dimension_field("a")
+    b = dimension_field("b")
+    c = dimension_field("c")
+    d = dimension_field("d")
     def __init__(self, a, b, c, d):
-        self.a = a
-        self.b = b
-        self.c = c
-        self.d = d
+        self._a = a
+        self._b = b
+        self._c = c
+        self._d = d
+        self._perimeter = self._square = self._squareSurface = self._volume = None
     def dimension(self):
         return 2
     def perimeter(self):
-        return self.a + self.b + self.c + self.d
+        perimeter = self._perimeter
+        if perimeter is None:
+            perimeter = self._perimeter = self._a + self._b + self._c + self._d
+        return perimeter
     def square(self):
-        a, b, c, d = self.a, self.b, self.c, self.d
+        square = self._square
+        if square is None:
+            square = self._square = self.trapeze_square()
+        return square
+    def trapeze_square(self):
+        a, b, c, d = self._a, self._b, self._c, self._d
         if a < b:
             a, b = b, a
             c, d = d, c
@@ -143,30 +228,51 @@ class Trapeze(Figure):
 
 
 class Parallelogram(Figure):
+    __slots__ = ("_a", "_b", "_para_height")
+    a = dimension_field("a")
+    b = dimension_field("b")
+    para_height = dimension_field("para_height")
     def __init__(self, a, b, height):
-        self.a = a
-        self.b = b
-        self.para_height = height
+        self._a = a
+        self._b = b
+        self._para_height = height
+        self._perimeter = self._square = self._squareSurface = self._volume = None
     def dimension(self):
         return 2
     def perimeter(self):
-        return 2 * (self.a + self.b)
+        perimeter = self._perimeter
+        if perimeter is None:
+            perimeter = self._perimeter = 2 * (self._a + self._b)
+        return perimeter
     def square(self):
-        return self.a * self.para_height
+        square = self._square
+        if square is None:
+            square = self._square = self._a * self._para_height
+        return square
 
 
 class Circle(Figure):
+    __slots__ = ("_radius",)
+    radius = dimension_field("radius")
     def __init__(self, radius):
-        self.radius = radius
+        self._radius = radius
+        self._perimeter = self._square = self._squareSurface = self._volume = None
     def dimension(self):
         return 2
     def perimeter(self):
-        return 2 * math.pi * self.radius
+        perimeter = self._perimeter
+        if perimeter is None:
+            perimeter = self._perimeter = 2 * math.pi * self._radius
+        return perimeter
     def square(self):
-        return math.pi * self.radius ** 2
+        square = self._square
+        if square is None:
+            square = self._square = math.pi * self._radius ** 2
+        return square
 
 
 class Ball(Circle):
+    __slots__ = ()
     def __init__(self, radius):
         super().__init__(radius)
     def dimension(self):
@@ -174,90 +280,334 @@ class Ball(Circle):
     def squareSurface(self):
         return 4 * super().square()
     def volume(self):
-        return (4 / 3) * math.pi * self.radius ** 3
+        volume = self._volume
+        if volume is None:
+            volume = self._volume = (4 / 3) * math.pi * self._radius ** 3
+        return volume
 
 
 class Cone(Circle):
+    __slots__ = ("_cone_height",)
+    cone_height = dimension_field("cone_height")
     def __init__(self, radius, height):
         super().__init__(radius)
-        self.cone_height = height
+        self._cone_height = height
     def dimension(self):
         return 3
     def squareSurface(self):
-        slant = math.sqrt(self.radius ** 2 + self.cone_height ** 2)
-        return math.pi * self.radius * slant
+        surface = self._squareSurface
+        if surface is None:
+            slant = math.sqrt(self._radius ** 2 + self._cone_height ** 2)
+            surface = self._squareSurface = math.pi * self._radius * slant
+        return surface
     def squareBase(self):
         return super().square()
     def height(self):
-        return self.cone_height
+        return self._cone_height
     def volume(self):
-        return (super().square() * self.cone_height) / 3
+        volume = self._volume
+        if volume is None:
+            volume = self._volume = (super().square() * self._cone_height) / 3
+        return volume
 
 
 class TriangularPrism(Triangle):
+    __slots__ = ("_prism_height",)
+    prism_height = dimension_field("prism_height")
     def __init__(self, a, b, c, height):
         super().__init__(a, b, c)
-        self.prism_height = height
+        self._prism_height = height
     def dimension(self):
         return 3
     def squareSurface(self):
-        return super().perimeter() * self.prism_height
+        surface = self._squareSurface
+        if surface is None:
+            surface = self._squareSurface = super().perimeter() * self._prism_height
+        return surface
     def squareBase(self):
         return super().square()
     def height(self):
-        return self.prism_height
+        return self._prism_height
     def volume(self):
-        base_area = super().square()
-        return base_area * self.prism_height
-
-
-def read_figures(filename):
+        volume = self._volume
+        if volume is None:
+            base_area = super().square()
+            volume = self._volume = base_area * self._prism_height
+        return volume
+
+
+FIGURE_INFO = {
+    'Triangle': (Triangle, 3),
+    'Rectangle': (Rectangle, 2),
+    'Trapeze': (Trapeze, 4),
+    'Parallelogram': (Parallelogram, 3),
+    'Circle': (Circle, 1),
+    'Ball': (Ball, 1),
+    'TriangularPyramid': (TriangularPyramid, 2),
+    'QuadrangularPyramid': (QuadrangularPyramid, 3),
+    'RectangularParallelepiped': (RectangularParallelepiped, 3),
+    'Cone': (Cone, 2),
+    'TriangularPrism': (TriangularPrism, 4),
+}
+FIGURE_FIELDS = {
+    Triangle: ('a', 'b', 'c'),
+    TriangularPyramid: ('a', 'pyramid_height'),
+    Rectangle: ('a', 'b'),
+    QuadrangularPyramid: ('a', 'b', 'pyramid_height'),
+    RectangularParallelepiped: ('a', 'b', 'c'),
+    Trapeze: ('a', 'b', 'c', 'd'),
+    Parallelogram: ('a', 'b', 'para_height'),
+    Circle: ('radius',),
+    Ball: ('radius',),
+    Cone: ('radius', 'cone_height'),
+    TriangularPrism: ('a', 'b', 'c', 'prism_height'),
+}
+METRIC_SLOTS = operator.attrgetter(*Figure.__slots__)
+FIGURE_TAGS = {name: tag for tag, name in enumerate(FIGURE_INFO)}
+BINARY_MAGIC = b"FIGURES1"
+BINARY_RECORD = struct.Struct("<B7x4d")
+CHUNK_SIZE = 64 * 1024 * 1024
+
+
+def parse_figure(line, filename, stats=None):
+    parts = line.split()
+    if not parts:
+        return None, None
+    name = parts[0]
+    info = FIGURE_INFO.get(name)
+    if info is None:
+        reason, message = "unknown", f"Unknown figure: {name} in file {filename}"
+    elif len(parts) - 1 != info[1]:
+        reason, message = "arity", f"Invalid number of parameters for {name} in file {filename}"
+    else:
+        try:
+            params = list(map(float, parts[1:]))
+        except ValueError as e:
+            reason, message = "number", f"Error creating {name} from file {filename}: {e}"
+        else:
+            return info[0](*[int(p) if p.is_integer() else p for p in params]), None
+    if stats is not None:
+        stats[reason] += 1
+    return None, message
+
+
+class MetricCache:
+    def __init__(self, maxsize=65536, warmup=4096, min_hit_rate=0.9):
+        self.maxsize = maxsize
+        self.warmup = warmup
+        self.min_hit_rate = min_hit_rate
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = False
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = self.misses = 0
+        self.bypassed = False
+
+    def parse_figure(self, line, filename, stats=None):
+        key = tuple(line.split())
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            total = self.hits + self.misses
+            if total >= self.warmup and self.hits < self.min_hit_rate * total:
+                self.bypassed = True
+            figure, message = parse_figure(line, filename, stats)
+            if figure is None:
+                return None, message
+            figure.volume()
+            cls = figure.__class__
+            self._entries[key] = (cls, [getattr(figure, field) for field in FIGURE_FIELDS[cls]], METRIC_SLOTS(figure))
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+            return figure, None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        cls, params, metrics = entry
+        figure = cls(*params)
+        figure._perimeter, figure._square, figure._squareSurface, figure._volume = metrics
+        return figure, None
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+FIGURE_CACHE = MetricCache()
+
+
+def read_figures(filename, stats=None, cache=FIGURE_CACHE):
     figures = []
-    figure_info = {
-        'Triangle': (Triangle, 3),
-        'Rectangle': (Rectangle, 2),
-        'Trapeze': (Trapeze, 4),
-        'Parallelogram': (Parallelogram, 3),
-        'Circle': (Circle, 1),
-        'Ball': (Ball, 1),
-        'TriangularPyramid': (TriangularPyramid, 2),
-        'QuadrangularPyramid': (QuadrangularPyramid, 3),
-        'RectangularParallelepiped': (RectangularParallelepiped, 3),
-        'Cone': (Cone, 2),
-        'TriangularPrism': (TriangularPrism, 4),
-    }
     try:
         with open(filename, 'r') as f:
             for line in f:
-                line = line.strip()
-                if not line:
-                    continue
+                if cache is None or cache.bypassed:
+                    figure, message = parse_figure(line, filename, stats)
+                else:
+                    figure, message = cache.parse_figure(line, filename, stats)
+                if figure:
+                    figures.append(figure)
+                elif message and stats is None:
+                    print(message)
+    except FileNotFoundError:
+        print(f"File {filename} not found.")
+    return figures
+
+
+def convert_to_binary(filename, binary_filename):
+    with open(filename, 'r') as f, open(binary_filename, 'wb') as out:
+        out.write(BINARY_MAGIC)
+        for line in f:
+            figure, message = parse_figure(line, filename)
+            if message:
+                print(message)
+            elif figure:
                 parts = line.split()
-                if not parts:
-                    continue
-                name = parts[0]
-                params = parts[1:]
-                info = figure_info.get(name)
-                if not info:
-                    print(f"Unknown figure: {name} in file {filename}")
-                    continue
-                cls, param_count = info
-                if len(params) != param_count:
-                    print(f"Invalid number of parameters for {name} in file {filename}")
-                    continue
-                try:
-                    params = list(map(float, params))
-                    params = [int(p) if p.is_integer() else p for p in params]
-                    instance = cls(*params)
-                    figures.append(instance)
-                except Exception as e:
-                    print(f"Error creating {name} from file {filename}: {e}")
+                params = list(map(float, parts[1:]))
+                out.write(BINARY_RECORD.pack(FIGURE_TAGS[parts[0]], *params, *[0.0] * (4 - len(params))))
+
+
+def read_figures_binary(filename):
+    classes = list(FIGURE_INFO.values())
+    figures = []
+    try:
+        with open(filename, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            size = len(mm) - len(BINARY_MAGIC)
+            if mm[:len(BINARY_MAGIC)] != BINARY_MAGIC or size < 0 or size % BINARY_RECORD.size:
+                raise ValueError(f"File {filename} is not a binary figure file")
+            view = memoryview(mm)[len(BINARY_MAGIC):]
+            try:
+                for tag, *params in BINARY_RECORD.iter_unpack(view):
+                    cls, param_count = classes[tag]
+                    params = [int(p) if p.is_integer() else p for p in params[:param_count]]
+                    figures.append(cls(*params))
+            finally:
+                view.release()
     except FileNotFoundError:
         print(f"File {filename} not found.")
     return figures
 
 
-def process_files(files, output_file="output.txt"):
+def chunk_ranges(filename, chunk_size=CHUNK_SIZE):
+    size = os.path.getsize(filename)
+    return [(start, min(start + chunk_size, size)) for start in range(0, size, chunk_size)]
+
+
+def reduce_figures_chunk(filename, start, end):
+    count, max_figure, max_volume, messages = 0, None, None, []
+    with open(filename, 'rb') as f:
+        if start:
+            f.seek(start - 1)
+            start += len(f.readline()) - 1
+        while start < end:
+            line = f.readline()
+            if not line:
+                break
+            start += len(line)
+            figure, message = parse_figure(line.decode(), filename)
+            if message:
+                messages.append(message)
+            elif figure:
+                count += 1
+                volume = figure.volume()
+                if max_figure is None or volume > max_volume:
+                    max_figure, max_volume = figure, volume
+    return count, max_figure, max_volume, messages
+
+
+def reduce_files_parallel(files, workers=None, chunk_size=CHUNK_SIZE):
+    results = {}
+    with ProcessPoolExecutor(workers) as pool:
+        jobs = {}
+        for file in files:
+            if file not in jobs and os.path.exists(file):
+                jobs[file] = [pool.submit(reduce_figures_chunk, file, start, end)
+                              for start, end in chunk_ranges(file, chunk_size)]
+        for file, futures in jobs.items():
+            total, max_figure, max_volume = 0, None, None
+            for future in futures:
+                count, figure, volume, messages = future.result()
+                for message in messages:
+                    print(message)
+                total += count
+                if figure is not None and (max_figure is None or volume > max_volume):
+                    max_figure, max_volume = figure, volume
+            results[file] = (total, max_figure)
+    return results
+
+
+def figure_to_state(figure):
+    if figure is None:
+        return None
+    return [figure.__class__.__name__, [getattr(figure, field) for field in FIGURE_FIELDS[figure.__class__]]]
+
+
+def figure_from_state(state):
+    if state is None:
+        return None
+    return FIGURE_INFO[state[0]][0](*state[1])
+
+
+def reduce_figures_incremental(filename, state=None):
+    size = os.path.getsize(filename)
+    if state is None or state['offset'] > size:
+        offset, count, max_figure, max_volume = 0, 0, None, None
+    else:
+        offset, count, max_volume = state['offset'], state['count'], state['max_volume']
+        max_figure = figure_from_state(state['max_figure'])
+    tail = None
+    with open(filename, 'rb') as f:
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b'\n'):
+                tail = line
+                break
+            offset += len(line)
+            figure, message = parse_figure(line.decode(), filename)
+            if message:
+                print(message)
+            elif figure:
+                count += 1
+                volume = figure.volume()
+                if max_figure is None or volume > max_volume:
+                    max_figure, max_volume = figure, volume
+    state = {'offset': offset, 'count': count, 'max_figure': figure_to_state(max_figure), 'max_volume': max_volume}
+    if tail:
+        figure, message = parse_figure(tail.decode(), filename)
+        if message:
+            print(message)
+        elif figure:
+            count += 1
+            if max_figure is None or figure.volume() > max_volume:
+                max_figure = figure
+    return count, max_figure, state
+
+
+def reduce_files_incremental(files, checkpoint_file):
+    try:
+        with open(checkpoint_file, 'r') as f:
+            checkpoint = json.load(f)
+    except FileNotFoundError:
+        checkpoint = {}
+    results = {}
+    for file in files:
+        if os.path.exists(file):
+            count, max_figure, checkpoint[file] = reduce_figures_incremental(file, checkpoint.get(file))
+            results[file] = (count, max_figure)
+    with open(checkpoint_file + '.tmp', 'w') as f:
+        json.dump(checkpoint, f)
+    os.replace(checkpoint_file + '.tmp', checkpoint_file)
+    return results
+
+
+def process_files(files, output_file="output.txt", workers=None, chunk_size=CHUNK_SIZE, reader=read_figures,
+                  finder=None, checkpoint=None):
+    finder = finder or find_max_figure
     with open(output_file, 'w') as f:
         f.write("Class Hierarchy (UML):\n")
         f.write("Figure\n")
@@ -274,15 +624,23 @@ def process_files(files, output_file="output.txt"):
         f.write("        --> Cone\n")
         f.write("\n")
 
+        reduced = None
+        if checkpoint is not None:
+            reduced = reduce_files_incremental(files, checkpoint)
+        elif workers is not None:
+            reduced = reduce_files_parallel(files, workers, chunk_size)
         for file in files:
             if not os.path.exists(file):
                 f.write(f"File {file} does not exist.\n")
                 continue
-            figures = read_figures(file)
-            if not figures:
+            if reduced is None:
+                figures = reader(file)
+                count, max_figure = len(figures), finder(figures)
+            else:
+                count, max_figure = reduced[file]
+            if not count:
                 f.write(f"No valid figures found in {file}.\n")
                 continue
-            max_figure = find_max_figure(figures)
             if max_figure:
                 f.write(f"\nFigure with the largest measure in {file}:\n")
                 write_figure_info(max_figure, f)
@@ -294,6 +652,213 @@ def find_max_figure(figures):
     return max(figures, key=lambda x: x.volume())
 
 
+def triangle_square_kernel(a, b, c):
+    valid = (a + b > c) & (a + c > b) & (b + c > a)
+    s = (a + b + c) / 2
+    value = s * (s - a) * (s - b) * (s - c)
+    return np.where(valid & (value >= 0), np.sqrt(np.abs(value)), 0.0)
+
+
+def trapeze_square_kernel(a, b, c, d):
+    swap = a < b
+    a, b, c, d = np.where(swap, b, a), np.where(swap, a, b), np.where(swap, d, c), np.where(swap, c, d)
+    delta = a - b
+    with np.errstate(divide='ignore', invalid='ignore'):
+        y = (np.float_power(delta, 2) - np.float_power(c, 2) + np.float_power(d, 2)) / (2 * delta)
+        h2 = np.float_power(d, 2) - np.float_power(y, 2)
+    h = np.sqrt(np.where(h2 >= 0, h2, 0.0))
+    middle = (a + b) / 2
+    return np.where(delta == 0, middle * c, np.where(h2 >= 0, middle * h, 0.0))
+
+
+def triangle_kernel(a, b, c):
+    square = triangle_square_kernel(a, b, c)
+    return {'perimeter': a + b + c, 'square': square, 'volume': square}
+
+
+def triangular_pyramid_kernel(a, h):
+    base = triangle_square_kernel(a, a, a)
+    apothem = (a * math.sqrt(3)) / 6
+    slant = np.sqrt(np.float_power(h, 2) + np.float_power(apothem, 2))
+    return {'perimeter': a + a + a, 'square': base, 'squareSurface': 3 * (0.5 * a * slant),
+            'squareBase': base, 'height': h, 'volume': (base * h) / 3}
+
+
+def rectangle_kernel(a, b):
+    return {'perimeter': 2 * (a + b), 'square': a * b, 'volume': a * b}
+
+
+def quadrangular_pyramid_kernel(a, b, h):
+    base = a * b
+    slant1 = np.sqrt(np.float_power(h, 2) + np.float_power(b / 2, 2))
+    slant2 = np.sqrt(np.float_power(h, 2) + np.float_power(a / 2, 2))
+    surface = a * slant1 + b * slant2
+    return {'perimeter': 2 * (a + b), 'square': base, 'squareSurface': surface,
+            'squareBase': base, 'height': h, 'volume': (base * h) / 3}
+
+
+def rectangular_parallelepiped_kernel(a, b, c):
+    return {'perimeter': 2 * (a + b), 'square': a * b, 'squareSurface': 2 * (a * c + b * c),
+            'squareBase': a * b, 'height': c, 'volume': a * b * c}
+
+
+def trapeze_kernel(a, b, c, d):
+    square = trapeze_square_kernel(a, b, c, d)
+    return {'perimeter': a + b + c + d, 'square': square, 'volume': square}
+
+
+def parallelogram_kernel(a, b, h):
+    return {'perimeter': 2 * (a + b), 'square': a * h, 'volume': a * h}
+
+
+def circle_kernel(r):
+    square = math.pi * np.float_power(r, 2)
+    return {'perimeter': 2 * math.pi * r, 'square': square, 'volume': square}
+
+
+def ball_kernel(r):
+    square = math.pi * np.float_power(r, 2)
+    return {'perimeter': 2 * math.pi * r, 'square': square, 'squareSurface': 4 * square,
+            'volume': (4 / 3) * math.pi * np.float_power(r, 3)}
+
+
+def cone_kernel(r, h):
+    base = math.pi * np.float_power(r, 2)
+    slant = np.sqrt(np.float_power(r, 2) + np.float_power(h, 2))
+    return {'perimeter': 2 * math.pi * r, 'square': base, 'squareSurface': math.pi * r * slant,
+            'squareBase': base, 'height': h, 'volume': (base * h) / 3}
+
+
+def triangular_prism_kernel(a, b, c, h):
+    base = triangle_square_kernel(a, b, c)
+    perimeter = a + b + c
+    return {'perimeter': perimeter, 'square': base, 'squareSurface': perimeter * h,
+            'squareBase': base, 'height': h, 'volume': base * h}
+
+
+FIGURE_KERNELS = {
+    Triangle: triangle_kernel,
+    TriangularPyramid: triangular_pyramid_kernel,
+    Rectangle: rectangle_kernel,
+    QuadrangularPyramid: quadrangular_pyramid_kernel,
+    RectangularParallelepiped: rectangular_parallelepiped_kernel,
+    Trapeze: trapeze_kernel,
+    Parallelogram: parallelogram_kernel,
+    Circle: circle_kernel,
+    Ball: ball_kernel,
+    Cone: cone_kernel,
+    TriangularPrism: triangular_prism_kernel,
+}
+BATCH_METRICS = ('perimeter', 'square', 'squareSurface', 'squareBase', 'height', 'volume')
+FIGURE_CODES = {cls: code for code, cls in enumerate(FIGURE_KERNELS)}
+FIGURE_GETTERS = {cls: [operator.attrgetter("_" + field) for field in fields] for cls, fields in FIGURE_FIELDS.items()}
+
+
+def evaluate_figures(figures):
+    if np is None:
+        raise ImportError("evaluate_figures requires numpy")
+    codes = np.fromiter(map(FIGURE_CODES.get, map(type, figures), itertools.repeat(-1)), np.intp, len(figures))
+    result = {metric: np.full(len(figures), np.nan) for metric in BATCH_METRICS}
+    for i in np.flatnonzero(codes < 0).tolist():
+        for metric in BATCH_METRICS:
+            value = getattr(figures[i], metric)()
+            result[metric][i] = np.nan if value is None else value
+    for code, (cls, kernel) in enumerate(FIGURE_KERNELS.items()):
+        positions = np.flatnonzero(codes == code)
+        if not len(positions):
+            continue
+        members = list(map(figures.__getitem__, positions.tolist()))
+        columns = [np.fromiter(map(getter, members), np.float64, len(members)) for getter in FIGURE_GETTERS[cls]]
+        for metric, values in kernel(*columns).items():
+            result[metric][positions] = values
+    return result
+
+
+def find_max_figure_batch(figures):
+    if not figures:
+        return None
+    return figures[int(np.argmax(evaluate_figures(figures)['volume']))]
+
+
+def figure_area(figure):
+    if figure.dimension() == 2:
+        return figure.square()
+    return figure.squareSurface()
+
+
+FIGURE_METRICS = {
+    'volume': lambda figure: figure.volume(),
+    'area': figure_area,
+    'perimeter': lambda figure: figure.perimeter(),
+}
+
+
+class FigureIndex:
+    def __init__(self, figures, metrics=FIGURE_METRICS):
+        self.figures = list(figures)
+        self.metrics = list(metrics)
+        self.dimensions = {}
+        groups = {}
+        for i, figure in enumerate(self.figures):
+            name = figure.__class__.__name__
+            groups.setdefault(name, []).append(i)
+            self.dimensions[name] = figure.dimension()
+        self._keys = {}
+        self._values = {}
+        for metric, key in metrics.items():
+            for name, positions in groups.items():
+                keys = sorted((key(self.figures[i]), -i) for i in positions)
+                self._keys[metric, name] = keys
+                self._values[metric, name] = [value for value, _ in keys]
+
+    def __len__(self):
+        return len(self.figures)
+
+    def classes(self):
+        return list(self.dimensions)
+
+    def _names(self, metric, cls=None):
+        if metric not in self.metrics:
+            raise KeyError(f"Unknown metric: {metric}")
+        return [name for name in self.dimensions if cls is None or name == cls]
+
+    def top(self, k, metric='volume', cls=None):
+        groups = [reversed(self._keys[metric, name]) for name in self._names(metric, cls)]
+        ordered = heapq.merge(*groups, reverse=True)
+        result = []
+        for _, position in ordered:
+            if len(result) >= k:
+                break
+            result.append(self.figures[-position])
+        return result
+
+    def largest(self, metric='volume', cls=None):
+        top = self.top(1, metric, cls)
+        return top[0] if top else None
+
+    def largest_by_class(self, metric='volume'):
+        return {name: self.largest(metric, name) for name in self.dimensions}
+
+    def largest_by_dimension(self, metric='volume'):
+        best = {}
+        for name in self._names(metric):
+            dimension = self.dimensions[name]
+            key = self._keys[metric, name][-1]
+            if dimension not in best or key > best[dimension]:
+                best[dimension] = key
+        return {dimension: self.figures[-key[1]] for dimension, key in best.items()}
+
+    def in_range(self, low, high, metric='area', cls=None):
+        positions = []
+        for name in self._names(metric, cls):
+            values = self._values[metric, name]
+            keys = self._keys[metric, name]
+            start = bisect.bisect_left(values, low)
+            end = bisect.bisect_right(values, high)
+            positions.extend(-position for _, position in keys[start:end])
+        return [self.figures[i] for i in sorted(positions)]
+
+
 def write_figure_info(figure, file_handle):
     if figure is None:
         return
@@ -308,9 +873,9 @@ def write_figure_info(figure, file_handle):
         file_handle.write(f"Volume: {figure.volume()}\n")
 
 
-def main():
+def main(workers=None):
     files = ['input01.txt', 'input02.txt', 'input03.txt']
-    process_files(files)
+    process_files(files, workers=workers)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
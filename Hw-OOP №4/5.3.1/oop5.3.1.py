@@ -1,5 +1,16 @@
+import itertools
 import math
+import operator
+import os
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
 class Rational:
+    __slots__ = ("_n", "_d", "_reduced")
+    lazy_reduce = False
+    reduce_threshold = 1 << 64
+    intern_limit = 1024
+    _interned = {}
+
     def __init__(self, *args):
         if len(args) == 2:
             n, d = args
@@ -7,8 +18,8 @@ class Rational:
                 raise TypeError("Чисельник і знаменник повинні бути цілими числами")
             if d == 0:
                 raise ZeroDivisionError("Знаменник не може бути нулем")
-            self.n = n
-            self.d = d
+            self._n = n
+            self._d = d
             self._reduce()
         elif len(args) == 1:
             s = args[0]
@@ -20,57 +31,102 @@ class Rational:
             n, d = int(parts[0]), int(parts[1])
             if d == 0:
                 raise ZeroDivisionError("Знаменник не може бути нулем")
-            self.n = n
-            self.d = d
+            self._n = n
+            self._d = d
             self._reduce()
         else:
             raise TypeError("Неправильна кількість аргументів")
 
+    @classmethod
+    def _raw(cls, n, d):
+        limit = cls.intern_limit
+        if -limit <= n <= limit and d <= limit:
+            key = n << 32 | d
+            self = cls._interned.get(key)
+            if self is None:
+                self = cls._interned[key] = object.__new__(cls)
+                self._n = n
+                self._d = d
+                self._reduced = True
+            return self
+        self = object.__new__(cls)
+        self._n = n
+        self._d = d
+        self._reduced = True
+        return self
+
+    @classmethod
+    def _make(cls, n, d):
+        if d < 0:
+            n, d = -n, -d
+        limit = cls.reduce_threshold
+        if cls.lazy_reduce and -limit < n < limit and d < limit:
+            self = object.__new__(cls)
+            self._n = n
+            self._d = d
+            self._reduced = False
+            return self
+        gcd = math.gcd(n, d)
+        return cls._raw(n // gcd, d // gcd)
+
     def _reduce(self):
-        gcd = math.gcd(self.n, self.d)
-        self.n //= gcd
-        self.d //= gcd
-        if self.d < 0:
-            self.n = -self.n
-            self.d = -self.d
+        gcd = math.gcd(self._n, self._d)
+        self._n //= gcd
+        self._d //= gcd
+        if self._d < 0:
+            self._n = -self._n
+            self._d = -self._d
+        self._reduced = True
+
+    @property
+    def n(self):
+        if not self._reduced:
+            self._reduce()
+        return self._n
+
+    @property
+    def d(self):
+        if not self._reduced:
+            self._reduce()
+        return self._d
 
     def __add__(self, other):
         if isinstance(other, int):
-            other = Rational(other, 1)
+            other = Rational._raw(other, 1)
         elif not isinstance(other, Rational):
             return NotImplemented
-        n = self.n * other.d + other.n * self.d
-        d = self.d * other.d
-        return Rational(n, d)
+        n = self._n * other._d + other._n * self._d
+        d = self._d * other._d
+        return Rational._make(n, d)
 
     def __sub__(self, other):
         if isinstance(other, int):
-            other = Rational(other, 1)
+            other = Rational._raw(other, 1)
         elif not isinstance(other, Rational):
             return NotImplemented
-        n = self.n * other.d - other.n * self.d
-        d = self.d * other.d
-        return Rational(n, d)
+        n = self._n * other._d - other._n * self._d
+        d = self._d * other._d
+        return Rational._make(n, d)
 
     def __mul__(self, other):
         if isinstance(other, int):
-            other = Rational(other, 1)
+            other = Rational._raw(other, 1)
         elif not isinstance(other, Rational):
             return NotImplemented
-        n = self.n * other.n
-        d = self.d * other.d
-        return Rational(n, d)
+        n = self._n * other._n
+        d = self._d * other._d
+        return Rational._make(n, d)
 
     def __truediv__(self, other):
         if isinstance(other, int):
-            other = Rational(other, 1)
+            other = Rational._raw(other, 1)
         elif not isinstance(other, Rational):
             return NotImplemented
-        if other.n == 0:
+        if other._n == 0:
             raise ZeroDivisionError("Ділення на нуль неможливе")
-        n = self.n * other.d
-        d = self.d * other.n
-        return Rational(n, d)
+        n = self._n * other._d
+        d = self._d * other._n
+        return Rational._make(n, d)
 
     def __call__(self):
         return self.n / self.d
@@ -84,15 +140,19 @@ class Rational:
             raise KeyError("Неправильний ключ")
 
     def __setitem__(self, key, value):
-        if not isinstance(value, int):
-            raise TypeError("Значення має бути цілим числом")
-        if key == "n":
-            self.n = value
-        elif key == "d":
-            if value == 0:
-                raise ZeroDivisionError("Знаменник не може бути нулем")
-            self.d = value
-        self._reduce()
+        raise TypeError("Раціональне число незмінне, створіть нове значення")
+
+    def __eq__(self, other):
+        if isinstance(other, int):
+            return self.d == 1 and self._n == other
+        if not isinstance(other, Rational):
+            return NotImplemented
+        return self.n == other.n and self.d == other.d
+
+    def __hash__(self):
+        if self.d == 1:
+            return hash(self._n)
+        return hash((self._n, self._d))
 
     def __str__(self):
         return f"{self.n}/{self.d}"
@@ -110,7 +170,7 @@ def tokenize(expression):
         elif '/' in token:
             tokens.append(Rational(token))
         else:
-            tokens.append(Rational(int(token), 1))
+            tokens.append(Rational._raw(int(token), 1))
     return tokens
 
 def infix_to_postfix(tokens):
@@ -146,14 +206,212 @@ def evaluate_postfix(postfix):
                 stack.append(a / b)
     return stack[0]
 
-with open('input01.txt', 'r') as file:
-    expressions = file.readlines()
+operators = {'+': operator.add, '-': operator.sub, '*': operator.mul, '/': operator.truediv}
+
+INT64_LIMIT = 1 << 63
+
+def pair_apply(op, a, b):
+    an, ad = a
+    bn, bd = b
+    if op == '+':
+        n = an * bd + bn * ad
+        d = ad * bd
+    elif op == '-':
+        n = an * bd - bn * ad
+        d = ad * bd
+    elif op == '*':
+        n = an * bn
+        d = ad * bd
+    elif bn:
+        n = an * bd
+        d = ad * bn
+    else:
+        return None
+    gcd = math.gcd(n, d)
+    n //= gcd
+    d //= gcd
+    if d < 0:
+        n, d = -n, -d
+    return n, d
+
+def exact(value):
+    if value.__class__ is tuple:
+        return Rational._raw(*value)
+    return value
+
+def compact(value):
+    n, d = value
+    if -INT64_LIMIT < n < INT64_LIMIT and d < INT64_LIMIT:
+        return value
+    return Rational._raw(n, d)
+
+def mixed_apply(op, a, b):
+    if a.__class__ is tuple and b.__class__ is tuple:
+        value = pair_apply(op, a, b)
+        if value is not None:
+            return compact(value)
+    return operators[op](exact(a), exact(b))
+
+def evaluate_mixed(postfix):
+    stack = []
+    for token in postfix:
+        if token.__class__ is str:
+            b = stack.pop()
+            stack[-1] = mixed_apply(token, stack[-1], b)
+        else:
+            stack.append(token)
+    return exact(stack[0])
+
+class CompiledExpression:
+    def __init__(self, expression):
+        self.source = expression
+        self.program = [(token.n, token.d) if isinstance(token, Rational) else token
+                        for token in infix_to_postfix(tokenize(expression))]
+
+    def __call__(self):
+        return evaluate_mixed(self.program)
+
+class ExpressionCache:
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def compile(self, expression):
+        compiled = self.entries.get(expression)
+        if compiled is not None:
+            self.hits += 1
+            self.entries.move_to_end(expression)
+            return compiled
+        self.misses += 1
+        compiled = CompiledExpression(expression)
+        self.entries[expression] = compiled
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+        return compiled
+
+    def evaluate(self, expression):
+        return self.compile(expression)()
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+expression_cache = ExpressionCache()
 
-for expr in expressions:
-    expr = expr.strip()
-    if expr:
-        tokens = tokenize(expr)
-        postfix = infix_to_postfix(tokens)
-        result = evaluate_postfix(postfix)
+class ExpressionDAG:
+    def __init__(self, cache=expression_cache):
+        self.cache = cache
+        self.nodes = []
+        self.index = {}
+        self.roots = []
+
+    def intern(self, key, node):
+        node_id = self.index.get(key)
+        if node_id is None:
+            node_id = self.index[key] = len(self.nodes)
+            self.nodes.append(node)
+        return node_id
+
+    def add(self, expression):
+        root = self.index.get(expression)
+        if root is None:
+            try:
+                stack = []
+                for token in self.cache.compile(expression).program:
+                    if token.__class__ is tuple:
+                        stack.append(self.intern(token, token))
+                    else:
+                        b = stack.pop()
+                        a = stack.pop()
+                        if token in '+*' and b < a:
+                            a, b = b, a
+                        key = (token, a, b)
+                        stack.append(self.intern(key, key))
+                root = self.index[expression] = stack[0]
+            except Exception as error:
+                root = error
+        self.roots.append(root)
+        return root
+
+    def evaluate(self):
+        values = []
+        errors = {}
+        for node in self.nodes:
+            if len(node) == 2:
+                values.append(node)
+                continue
+            op, a, b = node
+            if errors and (a in errors or b in errors):
+                errors[len(values)] = errors.get(a) or errors[b]
+                values.append(None)
+                continue
+            try:
+                values.append(mixed_apply(op, values[a], values[b]))
+            except Exception as error:
+                errors[len(values)] = error
+                values.append(None)
+        results = []
+        for root in self.roots:
+            if root.__class__ is not int:
+                results.append(root)
+            elif root in errors:
+                results.append(errors[root])
+            else:
+                results.append(exact(values[root]))
+        return results
+
+def evaluate_batch(expressions, cache=expression_cache):
+    dag = ExpressionDAG(cache)
+    for expression in expressions:
+        dag.add(expression)
+    return dag.evaluate()
+
+def read_expressions(filename):
+    with open(filename, 'r') as file:
+        for line in file:
+            expr = line.strip()
+            if expr:
+                yield expr
+
+def chunked(expressions, chunk_size):
+    expressions = iter(expressions)
+    while True:
+        chunk = list(itertools.islice(expressions, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+def evaluate_chunk(expressions):
+    return expressions, evaluate_batch(expressions)
+
+def evaluate_stream(expressions, chunk_size=10000):
+    for chunk in chunked(expressions, chunk_size):
+        yield from zip(*evaluate_chunk(chunk))
+
+def evaluate_parallel(expressions, workers=None, chunk_size=10000):
+    with ProcessPoolExecutor(workers) as pool:
+        window = 2 * (workers or os.cpu_count() or 1)
+        pending = deque()
+        for chunk in chunked(expressions, chunk_size):
+            pending.append(pool.submit(evaluate_chunk, chunk))
+            if len(pending) >= window:
+                yield from zip(*pending.popleft().result())
+        while pending:
+            yield from zip(*pending.popleft().result())
+
+def main(filename='input01.txt', workers=None):
+    expressions = read_expressions(filename)
+    if workers:
+        results = evaluate_parallel(expressions, workers)
+    else:
+        results = evaluate_stream(expressions)
+    for expr, result in results:
+        if isinstance(result, Exception):
+            raise result
         print(f"{expr} = {result}")
 
+if __name__ == "__main__":
+    main()
+
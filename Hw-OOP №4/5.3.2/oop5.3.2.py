@@ -1,11 +1,39 @@
+import math
+
+
 class Rational:
+    __slots__ = ("_numerator", "_denominator")
+    intern_limit = 1024
+    _interned = {}
+
     def __init__(self, numerator, denominator=1):
         if denominator == 0:
             raise ValueError("Знаменник не може бути нулем")
-        self.numerator = numerator
-        self.denominator = denominator
+        self._numerator = numerator
+        self._denominator = denominator
         self._normalize()
 
+    @property
+    def numerator(self):
+        return self._numerator
+
+    @property
+    def denominator(self):
+        return self._denominator
+
+    @classmethod
+    def of(cls, numerator, denominator=1):
+        limit = cls.intern_limit
+        if -limit <= numerator <= limit and 0 < denominator <= limit:
+            key = numerator << 32 | denominator
+            value = cls._interned.get(key)
+            if value is None:
+                value = cls(numerator, denominator)
+                value = cls._interned.setdefault(value._numerator << 32 | value._denominator, value)
+                cls._interned[key] = value
+            return value
+        return cls(numerator, denominator)
+
     def _gcd(self, a, b):
         a, b = abs(a), abs(b)
         while b:
@@ -13,19 +41,19 @@ class Rational:
         return a
 
     def _normalize(self):
-        gcd = self._gcd(self.numerator, self.denominator)
-        self.numerator //= gcd
-        self.denominator //= gcd
-        if self.denominator < 0:
-            self.numerator = -self.numerator
-            self.denominator = -self.denominator
+        gcd = self._gcd(self._numerator, self._denominator)
+        self._numerator //= gcd
+        self._denominator //= gcd
+        if self._denominator < 0:
+            self._numerator = -self._numerator
+            self._denominator = -self._denominator
 
     def __add__(self, other):
         if isinstance(other, int):
-            other = Rational(other)
-        num = self.numerator * other.denominator + other.numerator * self.denominator
-        denom = self.denominator * other.denominator
-        return Rational(num, denom)
+            other = Rational.of(other)
+        num = self._numerator * other._denominator + other._numerator * self._denominator
+        denom = self._denominator * other._denominator
+        return Rational.of(num, denom)
 
     def __radd__(self, other):
         return self.__add__(other)
@@ -36,6 +64,23 @@ class Rational:
         return f"{self.numerator}/{self.denominator}"
 
 
+def pairwise_sum(terms):
+    while len(terms) > 1:
+        paired = []
+        for i in range(0, len(terms) - 1, 2):
+            an, ad = terms[i]
+            bn, bd = terms[i + 1]
+            gcd = math.gcd(ad, bd)
+            n = an * (bd // gcd) + bn * (ad // gcd)
+            d = ad // gcd * bd
+            gcd = math.gcd(n, d)
+            paired.append((n // gcd, d // gcd))
+        if len(terms) % 2:
+            paired.append(terms[-1])
+        terms = paired
+    return terms[0]
+
+
 class RationalList:
     def __init__(self):
         self._items = []
@@ -44,7 +89,7 @@ class RationalList:
         if isinstance(item, Rational):
             self._items.append(item)
         elif isinstance(item, int):
-            self._items.append(Rational(item))
+            self._items.append(Rational.of(item))
         else:
             raise ValueError("Елемент має бути типу Rational або int")
 
@@ -55,7 +100,7 @@ class RationalList:
         if isinstance(value, Rational):
             self._items[index] = value
         elif isinstance(value, int):
-            self._items[index] = Rational(value)
+            self._items[index] = Rational.of(value)
         else:
             raise ValueError("Значення має бути типу Rational або int")
 
@@ -85,10 +130,10 @@ class RationalList:
     def sum(self):
         if not self._items:
             return Rational(0)
-        result = self._items[0]
-        for item in self._items[1:]:
-            result = result + item
-        return result
+        groups = {}
+        for item in self._items:
+            groups[item._denominator] = groups.get(item._denominator, 0) + item._numerator
+        return Rational.of(*pairwise_sum([(n, d) for d, n in groups.items()]))
 
     def __str__(self):
         return "[" + ", ".join(str(item) for item in self._items) + "]"
@@ -100,9 +145,9 @@ def parse_rational_string(line):
     for num in numbers:
         if '/' in num:
             numerator, denominator = map(int, num.split('/'))
-            rational_list.append(Rational(numerator, denominator))
+            rational_list.append(Rational.of(numerator, denominator))
         else:
-            rational_list.append(Rational(int(num)))
+            rational_list.append(Rational.of(int(num)))
     return rational_list
 
 
@@ -1,4 +1,7 @@
 import math
+import re
+import sys
+from collections import Counter
 
 class RationalError(ZeroDivisionError):
     def __init__(self, message="Знаменник не може бути нулем"):
@@ -11,6 +14,12 @@ class RationalValueError(ValueError):
         super().__init__(self.message)
 
 class Rational:
+    __slots__ = ("_n", "_d", "_reduced")
+    lazy_reduce = False
+    reduce_threshold = 1 << 64
+    intern_limit = 1024
+    _interned = {}
+
     def __init__(self, *args):
         if len(args) == 2:
             n, d = args
@@ -18,14 +27,15 @@ class Rational:
                 raise TypeError("Чисельник і знаменник повинні бути цілими числами")
             if d == 0:
                 raise RationalError("Знаменник не може бути нулем")
-            self.n = n
-            self.d = d
+            self._n = n
+            self._d = d
             self._reduce()
         elif len(args) == 1:
             s = args[0]
             if isinstance(s, int):
-                self.n = s
-                self.d = 1
+                self._n = s
+                self._d = 1
+                self._reduced = True
                 return
             if not isinstance(s, str):
                 raise TypeError("Один аргумент має бути рядком або цілим числом")
@@ -38,62 +48,107 @@ class Rational:
                 raise RationalValueError("Некоректний формат чисел у рядку")
             if d == 0:
                 raise RationalError("Знаменник не може бути нулем")
-            self.n = n
-            self.d = d
+            self._n = n
+            self._d = d
             self._reduce()
         else:
             raise TypeError("Неправильна кількість аргументів")
 
+    @classmethod
+    def _raw(cls, n, d):
+        limit = cls.intern_limit
+        if -limit <= n <= limit and d <= limit:
+            key = n << 32 | d
+            self = cls._interned.get(key)
+            if self is None:
+                self = cls._interned[key] = object.__new__(cls)
+                self._n = n
+                self._d = d
+                self._reduced = True
+            return self
+        self = object.__new__(cls)
+        self._n = n
+        self._d = d
+        self._reduced = True
+        return self
+
+    @classmethod
+    def _make(cls, n, d):
+        if d < 0:
+            n, d = -n, -d
+        limit = cls.reduce_threshold
+        if cls.lazy_reduce and -limit < n < limit and d < limit:
+            self = object.__new__(cls)
+            self._n = n
+            self._d = d
+            self._reduced = False
+            return self
+        gcd = math.gcd(n, d)
+        return cls._raw(n // gcd, d // gcd)
+
     def _reduce(self):
-        gcd = math.gcd(self.n, self.d)
-        self.n //= gcd
-        self.d //= gcd
-        if self.d < 0:
-            self.n = -self.n
-            self.d = -self.d
+        gcd = math.gcd(self._n, self._d)
+        self._n //= gcd
+        self._d //= gcd
+        if self._d < 0:
+            self._n = -self._n
+            self._d = -self._d
+        self._reduced = True
+
+    @property
+    def n(self):
+        if not self._reduced:
+            self._reduce()
+        return self._n
+
+    @property
+    def d(self):
+        if not self._reduced:
+            self._reduce()
+        return self._d
 
     def __add__(self, other):
         if isinstance(other, int):
-            other = Rational(other, 1)
+            other = Rational._raw(other, 1)
         elif not isinstance(other, Rational):
             raise RationalValueError("Додавання можливе лише з Rational або int")
-        n = self.n * other.d + other.n * self.d
-        d = self.d * other.d
-        return Rational(n, d)
+        n = self._n * other._d + other._n * self._d
+        d = self._d * other._d
+        return Rational._make(n, d)
 
     def __radd__(self, other):
         return self.__add__(other)
 
     def __sub__(self, other):
         if isinstance(other, int):
-            other = Rational(other, 1)
+            other = Rational._raw(other, 1)
         elif not isinstance(other, Rational):
             raise RationalValueError("Віднімання можливе лише з Rational або int")
-        n = self.n * other.d - other.n * self.d
-        d = self.d * other.d
-        return Rational(n, d)
+        n = self._n * other._d - other._n * self._d
+        d = self._d * other._d
+        return Rational._make(n, d)
 
     def __mul__(self, other):
         if isinstance(other, int):
-            other = Rational(other, 1)
+            other = Rational._raw(other, 1)
         elif not isinstance(other, Rational):
             raise RationalValueError("Множення можливе лише з Rational або int")
-        n = self.n * other.n
-        d = self.d * other.d
-        return Rational(n, d)
+        n = self._n * other._n
+        d = self._d * other._d
+        return Rational._make(n, d)
 
     def __truediv__(self, other):
         if isinstance(other, int):
             if other == 0:
                 raise RationalError("Ділення на нуль неможливе")
-            other = Rational(other, 1)
+            other = Rational._raw(other, 1)
         elif not isinstance(other, Rational):
             raise RationalValueError("Ділення можливе лише з Rational або int")
-        if other.n == 0:
+        if other._n == 0:
             raise RationalError("Ділення на нуль неможливе")
-        n = self.n * other.d
-        d = self.d * other.n
-        return Rational(n, d)
+        n = self._n * other._d
+        d = self._d * other._n
+        return Rational._make(n, d)
 
     def __call__(self):
         return self.n / self.d
@@ -107,17 +162,7 @@ class Rational:
             raise KeyError("Неправильний ключ")
 
     def __setitem__(self, key, value):
-        if not isinstance(value, int):
-            raise TypeError("Значення має бути цілим числом")
-        if key == "n":
-            self.n = value
-        elif key == "d":
-            if value == 0:
-                raise RationalError("Знаменник не може бути нулем")
-            self.d = value
-        else:
-            raise KeyError("Неправильний ключ")
-        self._reduce()
+        raise TypeError("Раціональне число незмінне, створіть нове значення")
 
     def __str__(self):
         return f"{self.n}/{self.d}"
@@ -125,6 +170,22 @@ class Rational:
     def __repr__(self):
         return f"Rational({self.n}, {self.d})"
 
+def pairwise_sum(terms):
+    while len(terms) > 1:
+        paired = []
+        for i in range(0, len(terms) - 1, 2):
+            an, ad = terms[i]
+            bn, bd = terms[i + 1]
+            gcd = math.gcd(ad, bd)
+            n = an * (bd // gcd) + bn * (ad // gcd)
+            d = ad // gcd * bd
+            gcd = math.gcd(n, d)
+            paired.append((n // gcd, d // gcd))
+        if len(terms) % 2:
+            paired.append(terms[-1])
+        terms = paired
+    return terms[0]
+
 class RationalList:
     def __init__(self):
         self._items = []
@@ -133,7 +194,7 @@ class RationalList:
         if isinstance(item, Rational):
             self._items.append(item)
         elif isinstance(item, int):
-            self._items.append(Rational(item, 1))
+            self._items.append(Rational._raw(item, 1))
         elif isinstance(item, str):
             try:
                 self._items.append(Rational(item))
@@ -149,7 +210,7 @@ class RationalList:
         if isinstance(value, Rational):
             self._items[index] = value
         elif isinstance(value, int):
-            self._items[index] = Rational(value, 1)
+            self._items[index] = Rational._raw(value, 1)
         elif isinstance(value, str):
             try:
                 self._items[index] = Rational(value)
@@ -194,37 +255,74 @@ class RationalList:
     def sum(self):
         if not self._items:
             return Rational(0, 1)
-        result = self._items[0]
-        for item in self._items[1:]:
-            result = result + item
-        return result
+        groups = {}
+        for item in self._items:
+            d = item.d
+            groups[d] = groups.get(d, 0) + item._n
+        return Rational._make(*pairwise_sum([(n, d) for d, n in groups.items()]))
 
     def __str__(self):
         return "[" + ", ".join(str(item) for item in self._items) + "]"
 
-def parse_rational_string(line, output_file):
-    rational_list = RationalList()
-    numbers = line.strip().split()
-    for num in numbers:
-        try:
-            if '/' in num:
-                parts = num.split('/')
-                if len(parts) != 2:
-                    raise RationalValueError(f"Неправильний формат раціонального числа: {num}")
-                try:
-                    numerator, denominator = map(int, parts)
-                except ValueError:
-                    raise RationalValueError(f"Некоректні числові значення в {num}")
-                rational_list.append(Rational(numerator, denominator))
+INTEGER = r"[+-]?\d+(?:_\d+)*"
+RATIONAL = re.compile(rf"({INTEGER})(?:/({INTEGER}))?")
+INT_DIGIT_LIMIT = getattr(sys, "get_int_max_str_digits", lambda: 0)()
+
+def too_many_digits(literal):
+    return len(literal.lstrip("+-").replace("_", "")) > INT_DIGIT_LIMIT
+
+class ParseErrors:
+    def __init__(self, max_samples=5):
+        self.max_samples = max_samples
+        self.counts = Counter()
+        self.samples = []
+
+    def add(self, kind, token, message):
+        self.counts[kind] += 1
+        if len(self.samples) < self.max_samples:
+            self.samples.append((token, message))
+
+    def total(self):
+        return sum(self.counts.values())
+
+    def write(self, output_file):
+        if not self.counts:
+            return
+        for token, message in self.samples:
+            print(f"Помилка при обробці '{token}': {message}", file=output_file)
+        details = ", ".join(f"{kind}: {count}" for kind, count in self.counts.most_common())
+        print(f"Усього помилок: {self.total()} ({details})", file=output_file)
+
+def parse_rational_string(line, errors=None):
+    if errors is None:
+        errors = ParseErrors()
+    values = []
+    append = values.append
+    match = RATIONAL.fullmatch
+    for num in line.split():
+        parsed = match(num)
+        if parsed is None:
+            if '/' not in num:
+                errors.add("некоректне ціле", num, f"Некоректне ціле число: {num}")
+            elif num.count('/') != 1:
+                errors.add("формат", num, f"Неправильний формат раціонального числа: {num}")
             else:
-                try:
-                    rational_list.append(int(num))
-                except ValueError:
-                    raise RationalValueError(f"Некоректне ціле число: {num}")
-        except (RationalError, RationalValueError) as e:
-            print(f"Помилка при обробці '{num}': {str(e)}", file=output_file)
+                errors.add("нечислові частини", num, f"Некоректні числові значення в {num}")
             continue
-    return rational_list
+        numerator, denominator = parsed.groups()
+        if INT_DIGIT_LIMIT and len(num) > INT_DIGIT_LIMIT and (
+                too_many_digits(numerator) or denominator is not None and too_many_digits(denominator)):
+            errors.add("задовге число", num, f"Число перевищує ліміт у {INT_DIGIT_LIMIT} цифр")
+            continue
+        if denominator is None:
+            append(Rational._raw(int(numerator), 1))
+        elif int(denominator):
+            append(Rational._make(int(numerator), int(denominator)))
+        else:
+            errors.add("нульовий знаменник", num, "Знаменник не може бути нулем")
+    rational_list = RationalList()
+    rational_list._items = values
+    return rational_list, errors
 
 def process_input_files(filenames):
     with open('outputs.txt', 'w', encoding='utf-8') as output_file:
@@ -234,7 +332,8 @@ def process_input_files(filenames):
                 with open(filename, 'r', encoding='utf-8') as file:
                     content = file.read()
                     print(f"Вміст файлу: {content.strip()}", file=output_file)
-                    rational_list = parse_rational_string(content, output_file)
+                    rational_list, errors = parse_rational_string(content)
+                    errors.write(output_file)
                     print(f"Створений RationalList: {rational_list}", file=output_file)
                     print(f"Сума елементів: {rational_list.sum()}", file=output_file)
             except FileNotFoundError:
@@ -1,142 +1,712 @@
+import heapq
+import json
 import math
+import mmap
+import operator
+import os
+import struct
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def dimension_field(name):
+    slot = "_" + name
+    def setter(self, value):
+        setattr(self, slot, value)
+        self._area = None
+    return property(operator.attrgetter(slot), setter)
 
 
 class Shape:
-    def perimeter(self):
+    __slots__ = ("_perimeter", "_area")
+    fields = ()
+    def __init__(self):
+        self._area = None
+    def reset_metrics(self):
+        self._area = None
+    def compute_metrics(self):
+        self._perimeter = self._area = 0
         return 0
+    def is_valid(self):
+        return False
+    def perimeter(self):
+        if self._area is None:
+            self.compute_metrics()
+        return self._perimeter
     def area(self):
-        return 0
+        area = self._area
+        if area is None:
+            area = self.compute_metrics()
+        return area
     def name(self):
         return ""
 
 
 class Triangle(Shape):
+    __slots__ = ("_a", "_b", "_c")
+    fields = ("a", "b", "c")
+    a = dimension_field("a")
+    b = dimension_field("b")
+    c = dimension_field("c")
     def __init__(self, a, b, c):
-        self.a = a
-        self.b = b
-        self.c = c
+        self._a = a
+        self._b = b
+        self._c = c
+        self._area = None
     def is_valid(self):
-        return (self.a > 0 and self.b > 0 and self.c > 0 and self.a + self.b > self.c and self.b + self.c > self.a and self.a + self.c > self.b)
-    def perimeter(self):
-        return self.a + self.b + self.c
-    def area(self):
-        if not self.is_valid():
-            return 0
-        s = self.perimeter() / 2
-        value = s * (s - self.a) * (s - self.b) * (s - self.c)
-        return math.sqrt(value) if value > 0 else 0
+        a, b, c = self._a, self._b, self._c
+        return a > 0 and b > 0 and c > 0 and a + b > c and b + c > a and a + c > b
+    def compute_metrics(self):
+        a, b, c = self._a, self._b, self._c
+        self._perimeter = perimeter = a + b + c
+        area = 0
+        if a > 0 and b > 0 and c > 0 and a + b > c and b + c > a and a + c > b:
+            s = perimeter / 2
+            value = s * (s - a) * (s - b) * (s - c)
+            area = math.sqrt(value) if value > 0 else 0
+        self._area = area
+        return area
     def name(self):
         return "Triangle"
 
 
 class Rectangle(Shape):
+    __slots__ = ("_a", "_b")
+    fields = ("a", "b")
+    a = dimension_field("a")
+    b = dimension_field("b")
     def __init__(self, a, b):
-        self.a = a
-        self.b = b
+        self._a = a
+        self._b = b
+        self._area = None
     def is_valid(self):
-        return self.a > 0 and self.b > 0
-    def perimeter(self):
-        return 2 * (self.a + self.b)
-    def area(self):
-        return self.a * self.b if self.is_valid() else 0
+        return self._a > 0 and self._b > 0
+    def compute_metrics(self):
+        a, b = self._a, self._b
+        self._perimeter = 2 * (a + b)
+        self._area = area = a * b if a > 0 and b > 0 else 0
+        return area
     def name(self):
         return "Rectangle"
 
 
 class Trapeze(Shape):
+    __slots__ = ("_a", "_b", "_c", "_d")
+    fields = ("a", "b", "c", "d")
+    a = dimension_field("a")
+    b = dimension_field("b")
+    c = dimension_field("c")
+    d = dimension_field("d")
     def __init__(self, a, b, c, d):
-        self.a = a
-        self.b = b
-        self.c = c
-        self.d = d
+        self._a = a
+        self._b = b
+        self._c = c
+        self._d = d
+        self._area = None
     def is_valid(self):
-        return (self.a >= 0 and self.b >= 0 and self.c > 0 and self.d > 0 and self.c ** 2 > (abs(self.a - self.b) / 2) ** 2)
-    def perimeter(self):
-        return self.a + self.b + self.c + self.d
-    def area(self):
-        if not self.is_valid():
-            return 0
-        h = math.sqrt(self.c ** 2 - (abs(self.a - self.b) / 2) ** 2)
-        return (self.a + self.b) / 2 * h
+        a, b, c, d = self._a, self._b, self._c, self._d
+        return a >= 0 and b >= 0 and c > 0 and d > 0 and c ** 2 > (abs(a - b) / 2) ** 2
+    def compute_metrics(self):
+        a, b, c, d = self._a, self._b, self._c, self._d
+        self._perimeter = a + b + c + d
+        area = 0
+        if a >= 0 and b >= 0 and c > 0 and d > 0 and c ** 2 > (abs(a - b) / 2) ** 2:
+            h = math.sqrt(c ** 2 - (abs(a - b) / 2) ** 2)
+            area = (a + b) / 2 * h
+        self._area = area
+        return area
     def name(self):
         return "Trapeze"
 
 
 class Parallelogram(Shape):
+    __slots__ = ("_a", "_b", "_h")
+    fields = ("a", "b", "h")
+    a = dimension_field("a")
+    b = dimension_field("b")
+    h = dimension_field("h")
     def __init__(self, a, b, h):
-        self.a = a
-        self.b = b
-        self.h = h
+        self._a = a
+        self._b = b
+        self._h = h
+        self._area = None
     def is_valid(self):
-        return self.a > 0 and self.b > 0 and self.h > 0
-    def perimeter(self):
-        return 2 * (self.a + self.b)
-    def area(self):
-        return self.a * self.h if self.is_valid() else 0
+        return self._a > 0 and self._b > 0 and self._h > 0
+    def compute_metrics(self):
+        a, b, h = self._a, self._b, self._h
+        self._perimeter = 2 * (a + b)
+        self._area = area = a * h if a > 0 and b > 0 and h > 0 else 0
+        return area
     def name(self):
         return "Parallelogram"
 
 
 class Circle(Shape):
+    __slots__ = ("_r",)
+    fields = ("r",)
+    r = dimension_field("r")
     def __init__(self, r):
-        self.r = r
+        self._r = r
+        self._area = None
     def is_valid(self):
-        return self.r > 0
-    def perimeter(self):
-        return 2 * math.pi * self.r
-    def area(self):
-        return math.pi * self.r ** 2 if self.is_valid() else 0
+        return self._r > 0
+    def compute_metrics(self):
+        r = self._r
+        self._perimeter = 2 * math.pi * r
+        self._area = area = math.pi * r ** 2 if r > 0 else 0
+        return area
     def name(self):
         return "Circle"
 
 
-def create_shape(line):
-    parts = line.split()
-    shape_type = parts[0]
-    params = list(map(float, parts[1:]))
+SHAPE_CLASSES = {
+    "Triangle": Triangle,
+    "Rectangle": Rectangle,
+    "Trapeze": Trapeze,
+    "Parallelogram": Parallelogram,
+    "Circle": Circle,
+}
+SHAPE_ARITY = {"Triangle": 3, "Rectangle": 2, "Trapeze": 4, "Parallelogram": 3, "Circle": 1}
+SHAPE_TAGS = {name: tag for tag, name in enumerate(SHAPE_ARITY)}
+BINARY_MAGIC = b"SHAPES01"
+BINARY_RECORD = struct.Struct("<B7x4d")
+
+
+def triangle_kernel(p):
+    a, b, c = p.T
+    valid = (a > 0) & (b > 0) & (c > 0) & (a + b > c) & (b + c > a) & (a + c > b)
+    perimeter = a + b + c
+    s = perimeter / 2
+    value = s * (s - a) * (s - b) * (s - c)
+    area = np.where(value > 0, np.sqrt(np.maximum(value, 0)), 0.0)
+    return valid, area, perimeter
+
+
+def rectangle_kernel(p):
+    a, b = p.T
+    return (a > 0) & (b > 0), a * b, 2 * (a + b)
+
+
+def trapeze_kernel(p):
+    a, b, c, d = p.T
+    half_diff = np.float_power(np.abs(a - b) / 2, 2)
+    valid = (a >= 0) & (b >= 0) & (c > 0) & (d > 0) & (np.float_power(c, 2) > half_diff)
+    h = np.sqrt(np.where(valid, np.float_power(c, 2) - half_diff, 0.0))
+    return valid, (a + b) / 2 * h, a + b + c + d
+
+
+def parallelogram_kernel(p):
+    a, b, h = p.T
+    return (a > 0) & (b > 0) & (h > 0), a * h, 2 * (a + b)
+
+
+def circle_kernel(p):
+    r = p[:, 0]
+    return r > 0, math.pi * np.float_power(r, 2), 2 * math.pi * r
+
+
+SHAPE_KERNELS = {
+    "Triangle": triangle_kernel,
+    "Rectangle": rectangle_kernel,
+    "Trapeze": trapeze_kernel,
+    "Parallelogram": parallelogram_kernel,
+    "Circle": circle_kernel,
+}
+
+
+def parse_float(token):
     try:
-        if shape_type == "Triangle":
-            shape = Triangle(*params)
-        elif shape_type == "Rectangle":
-            shape = Rectangle(*params)
-        elif shape_type == "Trapeze":
-            shape = Trapeze(*params)
-        elif shape_type == "Parallelogram":
-            shape = Parallelogram(*params)
-        elif shape_type == "Circle":
-            shape = Circle(*params)
+        return float(token)
+    except ValueError:
+        return None
+
+
+def parse_floats(tokens):
+    try:
+        return np.array(tokens, dtype=np.float64), None
+    except ValueError:
+        values = np.array(list(map(parse_float, tokens)), dtype=object)
+        parsed = values != None
+        values[~parsed] = np.nan
+        return values.astype(np.float64), parsed
+
+
+class ShapeBatch:
+    def __init__(self, params, order):
+        if np is None:
+            raise ImportError("ShapeBatch потребує numpy")
+        self.params = params
+        self.order = order
+
+    @classmethod
+    def from_lines(cls, lines):
+        tokens = {name: [] for name in SHAPE_ARITY}
+        order = {name: [] for name in SHAPE_ARITY}
+        for position, line in enumerate(lines):
+            parts = line.split()
+            if parts and len(parts) - 1 == SHAPE_ARITY.get(parts[0], -1):
+                tokens[parts[0]] += parts[1:]
+                order[parts[0]].append(position)
+        params = {}
+        positions = {}
+        for name, arity in SHAPE_ARITY.items():
+            values, parsed = parse_floats(tokens[name])
+            params[name] = values.reshape(-1, arity)
+            positions[name] = np.array(order[name], dtype=np.int64)
+            if parsed is not None:
+                rows = parsed.reshape(-1, arity).all(axis=1)
+                params[name] = params[name][rows]
+                positions[name] = positions[name][rows]
+        return cls(params, positions)
+
+    @classmethod
+    def from_file(cls, filename):
+        with open(filename, "r") as file:
+            return cls.from_lines(file)
+
+    @classmethod
+    def from_binary(cls, filename):
+        dtype = np.dtype([("tag", "u1"), ("pad", "V7"), ("params", "<f8", (4,))])
+        params = {}
+        positions = {}
+        with open(filename, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            check_binary_header(mm, filename)
+            records = np.frombuffer(mm, dtype=dtype, offset=len(BINARY_MAGIC))
+            for name, arity in SHAPE_ARITY.items():
+                positions[name] = np.flatnonzero(records["tag"] == SHAPE_TAGS[name])
+                params[name] = records["params"][positions[name], :arity]
+            del records
+        return cls(params, positions)
+
+    def evaluate(self):
+        result = {}
+        for name, p in self.params.items():
+            valid, area, perimeter = SHAPE_KERNELS[name](p)
+            result[name] = (p[valid], self.order[name][valid], area[valid], perimeter[valid])
+        return result
+
+    def __len__(self):
+        return sum(len(p) for p in self.params.values())
+
+    def find_max(self):
+        metrics = self.evaluate()
+        groups = [m for m in metrics.values() if len(m[1])]
+        if not groups:
+            return None, 0
+        max_area = max(m[2].max() for m in groups)
+        max_perimeter = max(m[3].max() for m in groups)
+        best = None
+        for name, (p, order, area, perimeter) in metrics.items():
+            hits = np.flatnonzero((area == max_area) & (perimeter == max_perimeter))
+            if len(hits) and (best is None or order[hits[0]] < best[0]):
+                best = (order[hits[0]], name, p[hits[0]])
+        count = sum(len(m[1]) for m in groups)
+        if best is None:
+            return None, count
+        return SHAPE_CLASSES[best[1]](*best[2].tolist()), count
+
+
+def parse_line(line, stats=None):
+    parts = line.split()
+    if not parts:
+        reason = "empty"
+    elif len(parts) - 1 != SHAPE_ARITY.get(parts[0], -1):
+        reason = "arity" if parts[0] in SHAPE_ARITY else "unknown"
+    else:
+        try:
+            return parts[0], list(map(float, parts[1:]))
+        except ValueError:
+            reason = "number"
+    if stats is not None:
+        stats[reason] += 1
+    return None, None
+
+
+def create_shape(line, stats=None):
+    parts = line.split()
+    if parts and len(parts) - 1 == SHAPE_ARITY.get(parts[0], -1):
+        try:
+            shape = SHAPE_CLASSES[parts[0]](*map(float, parts[1:]))
+        except ValueError:
+            pass
         else:
+            if shape.is_valid():
+                return shape
+            if stats is not None:
+                stats["invalid"] += 1
             return None
-        return shape if shape.is_valid() else None
-    except:
-        return None
+    parse_line(line, stats)
+    return None
+
+
+class MetricCache:
+    def __init__(self, maxsize=65536, warmup=4096, min_hit_rate=0.9):
+        self.maxsize = maxsize
+        self.warmup = warmup
+        self.min_hit_rate = min_hit_rate
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = False
+        self._entries = OrderedDict()
+        self._errors = Counter()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = self.misses = 0
+        self.bypassed = False
+
+    def create_shape(self, line, stats=None):
+        key = tuple(line.split())
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            entry = self._entries[key] = self._build_entry(line, key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+            total = self.hits + self.misses
+            if total >= self.warmup and self.hits < self.min_hit_rate * total:
+                self.bypassed = True
+        else:
+            self.hits += 1
+            self._entries.move_to_end(key)
+        cls, params, metrics, reason = entry
+        if cls is None:
+            if stats is not None and reason:
+                stats[reason] += 1
+            return None
+        shape = cls(*params)
+        shape._perimeter, shape._area = metrics
+        return shape
+
+    def _build_entry(self, line, key):
+        shape = create_shape(line)
+        if shape is None:
+            errors = self._errors
+            errors.clear()
+            create_shape(line, errors)
+            return None, None, None, next(iter(errors), None)
+        area = shape.compute_metrics()
+        return shape.__class__, tuple(map(float, key[1:])), (shape._perimeter, area), None
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+METRIC_CACHE = MetricCache()
 
 
-def process_file(filename):
+def result_message(filename, shape, count):
+    if not count:
+        return f"Фігури не знайдені у файлі {filename}\n", None
+    if shape:
+        return (f"Для файлу {filename}:\n" f"Фігура з найбільшою площею та периметром: {shape.name()} з площею {shape.area():.2f} і периметром {shape.perimeter():.2f}\n"), shape
+    return f"Для файлу {filename}: Жодна фігура не має одночасно максимальну площу і периметр\n", None
+
+
+def process_file(filename, stats=None, cache=METRIC_CACHE):
     shapes = []
     try:
         with open(filename, "r") as file:
             for line in file:
-                shape = create_shape(line.strip())
+                shape = create_shape(line, stats) if cache is None or cache.bypassed else cache.create_shape(line, stats)
                 if shape:
                     shapes.append(shape)
     except FileNotFoundError:
         return f"Файл {filename} не знайдено\n", None
     if not shapes:
-        return f"Фігури не знайдені у файлі {filename}\n", None
+        return result_message(filename, None, 0)
     max_area = max(shapes, key=lambda s: s.area()).area()
     max_perimeter = max(shapes, key=lambda s: s.perimeter()).perimeter()
     for shape in shapes:
         if shape.area() == max_area and shape.perimeter() == max_perimeter:
-            return (f"Для файлу {filename}:\n" f"Фігура з найбільшою площею та периметром: {shape.name()} з площею {shape.area():.2f} і периметром {shape.perimeter():.2f}\n"), shape
-    return f"Для файлу {filename}: Жодна фігура не має одночасно максимальну площу і периметр\n", None
+            return result_message(filename, shape, len(shapes))
+    return result_message(filename, None, len(shapes))
+
+
+def process_file_batch(filename):
+    try:
+        batch = ShapeBatch.from_file(filename)
+    except FileNotFoundError:
+        return f"Файл {filename} не знайдено\n", None
+    shape, count = batch.find_max()
+    return result_message(filename, shape, count)
+
+
+class ShapeReducer:
+    def __init__(self, top_k=0):
+        self.top_k = top_k
+        self.count = 0
+        self.max_area = None
+        self.max_perimeter = None
+        self.shape = None
+        self._top = []
+
+    def add(self, shape):
+        area = shape.area()
+        perimeter = shape.perimeter()
+        self.count += 1
+        if self.max_area is None:
+            self.max_area, self.max_perimeter, self.shape = area, perimeter, shape
+        elif area > self.max_area or perimeter > self.max_perimeter:
+            self.max_area = max(self.max_area, area)
+            self.max_perimeter = max(self.max_perimeter, perimeter)
+            matches = area == self.max_area and perimeter == self.max_perimeter
+            self.shape = shape if matches else None
+        elif self.shape is None and area == self.max_area and perimeter == self.max_perimeter:
+            self.shape = shape
+        if self.top_k:
+            entry = (area, -self.count, shape)
+            if len(self._top) < self.top_k:
+                heapq.heappush(self._top, entry)
+            elif entry > self._top[0]:
+                heapq.heapreplace(self._top, entry)
+
+    def merge(self, other):
+        if other.max_area is None:
+            return self
+        if self.max_area is None:
+            max_area, max_perimeter = other.max_area, other.max_perimeter
+        else:
+            max_area = max(self.max_area, other.max_area)
+            max_perimeter = max(self.max_perimeter, other.max_perimeter)
+        if not (self.shape and self.max_area == max_area and self.max_perimeter == max_perimeter):
+            matches = other.max_area == max_area and other.max_perimeter == max_perimeter
+            self.shape = other.shape if matches else None
+        self.max_area, self.max_perimeter = max_area, max_perimeter
+        if self.top_k:
+            for area, position, shape in other._top:
+                entry = (area, position - self.count, shape)
+                if len(self._top) < self.top_k:
+                    heapq.heappush(self._top, entry)
+                elif entry > self._top[0]:
+                    heapq.heapreplace(self._top, entry)
+        self.count += other.count
+        return self
+
+    def top(self):
+        return [entry[2] for entry in sorted(self._top, reverse=True)]
+
+    def to_state(self):
+        return {
+            "top_k": self.top_k,
+            "count": self.count,
+            "max_area": self.max_area,
+            "max_perimeter": self.max_perimeter,
+            "shape": shape_to_state(self.shape),
+            "top": [[area, position, shape_to_state(shape)] for area, position, shape in self._top],
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        reducer = cls(state["top_k"])
+        reducer.count = state["count"]
+        reducer.max_area = state["max_area"]
+        reducer.max_perimeter = state["max_perimeter"]
+        reducer.shape = shape_from_state(state["shape"])
+        reducer._top = [(area, position, shape_from_state(shape)) for area, position, shape in state["top"]]
+        return reducer
+
+
+def shape_to_state(shape):
+    if shape is None:
+        return None
+    return [shape.name(), [getattr(shape, field) for field in shape.fields]]
+
+
+def shape_from_state(state):
+    if state is None:
+        return None
+    return SHAPE_CLASSES[state[0]](*state[1])
+
+
+def reduce_file(filename, top_k=0, stats=None):
+    reducer = ShapeReducer(top_k)
+    with open(filename, "r") as file:
+        for line in file:
+            shape = create_shape(line, stats)
+            if shape:
+                reducer.add(shape)
+    return reducer
+
+
+def process_file_streaming(filename):
+    try:
+        reducer = reduce_file(filename)
+    except FileNotFoundError:
+        return f"Файл {filename} не знайдено\n", None
+    return result_message(filename, reducer.shape, reducer.count)
+
+
+def convert_to_binary(filename, binary_filename):
+    with open(filename, "r") as file, open(binary_filename, "wb") as binary_file:
+        binary_file.write(BINARY_MAGIC)
+        for line in file:
+            name, values = parse_line(line)
+            if name is not None:
+                values += [0.0] * (4 - len(values))
+                binary_file.write(BINARY_RECORD.pack(SHAPE_TAGS[name], *values))
+
+
+def check_binary_header(mm, filename):
+    size = len(mm) - len(BINARY_MAGIC)
+    if mm[:len(BINARY_MAGIC)] != BINARY_MAGIC or size < 0 or size % BINARY_RECORD.size:
+        raise ValueError(f"Файл {filename} не є двійковим файлом фігур")
+
+
+def iter_binary_shapes(filename):
+    classes = [(SHAPE_CLASSES[name], arity) for name, arity in SHAPE_ARITY.items()]
+    with open(filename, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        check_binary_header(mm, filename)
+        view = memoryview(mm)[len(BINARY_MAGIC):]
+        try:
+            for tag, *params in BINARY_RECORD.iter_unpack(view):
+                cls, arity = classes[tag]
+                shape = cls(*params[:arity])
+                if shape.is_valid():
+                    yield shape
+        finally:
+            view.release()
+
+
+def process_binary_file(filename):
+    reducer = ShapeReducer()
+    try:
+        for shape in iter_binary_shapes(filename):
+            reducer.add(shape)
+    except FileNotFoundError:
+        return f"Файл {filename} не знайдено\n", None
+    return result_message(filename, reducer.shape, reducer.count)
+
+
+CHUNK_SIZE = 64 * 1024 * 1024
+
+
+def chunk_ranges(filename, chunk_size=CHUNK_SIZE):
+    size = os.path.getsize(filename)
+    return [(start, min(start + chunk_size, size)) for start in range(0, size, chunk_size)]
+
+
+def reduce_chunk(filename, start, end, top_k=0):
+    reducer = ShapeReducer(top_k)
+    with open(filename, "rb") as file:
+        if start:
+            file.seek(start - 1)
+            start += len(file.readline()) - 1
+        while start < end:
+            line = file.readline()
+            if not line:
+                break
+            start += len(line)
+            shape = create_shape(line.decode())
+            if shape:
+                reducer.add(shape)
+    return reducer
+
+
+def process_files_parallel(filenames, workers=None, chunk_size=CHUNK_SIZE):
+    with ProcessPoolExecutor(workers) as pool:
+        jobs = []
+        for filename in filenames:
+            try:
+                ranges = chunk_ranges(filename, chunk_size)
+            except FileNotFoundError:
+                jobs.append((filename, None))
+                continue
+            jobs.append((filename, [pool.submit(reduce_chunk, filename, start, end) for start, end in ranges]))
+        results = []
+        for filename, futures in jobs:
+            if futures is None:
+                results.append((f"Файл {filename} не знайдено\n", None))
+                continue
+            reducer = ShapeReducer()
+            for future in futures:
+                reducer.merge(future.result())
+            results.append(result_message(filename, reducer.shape, reducer.count))
+    return results
+
+
+def load_checkpoint(checkpoint_filename):
+    try:
+        with open(checkpoint_filename, "r", encoding="utf-8") as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return {}
+
+
+def save_checkpoint(checkpoint_filename, checkpoint):
+    temporary = checkpoint_filename + ".tmp"
+    with open(temporary, "w", encoding="utf-8") as file:
+        json.dump(checkpoint, file)
+    os.replace(temporary, checkpoint_filename)
+
+
+def reduce_file_incremental(filename, state=None):
+    size = os.path.getsize(filename)
+    if state is None or state["offset"] > size:
+        reducer, offset = ShapeReducer(), 0
+    else:
+        reducer, offset = ShapeReducer.from_state(state["reducer"]), state["offset"]
+    tail = None
+    with open(filename, "rb") as file:
+        file.seek(offset)
+        for line in file:
+            if not line.endswith(b"\n"):
+                tail = line
+                break
+            offset += len(line)
+            shape = create_shape(line.decode())
+            if shape:
+                reducer.add(shape)
+    state = {"offset": offset, "reducer": reducer.to_state()}
+    if tail:
+        shape = create_shape(tail.decode())
+        if shape:
+            reducer = ShapeReducer.from_state(state["reducer"])
+            reducer.add(shape)
+    return reducer, state
+
+
+def process_files_incremental(filenames, checkpoint_filename):
+    checkpoint = load_checkpoint(checkpoint_filename)
+    results = []
+    for filename in filenames:
+        try:
+            reducer, checkpoint[filename] = reduce_file_incremental(filename, checkpoint.get(filename))
+        except FileNotFoundError:
+            checkpoint.pop(filename, None)
+            results.append((f"Файл {filename} не знайдено\n", None))
+            continue
+        results.append(result_message(filename, reducer.shape, reducer.count))
+    save_checkpoint(checkpoint_filename, checkpoint)
+    return results
+
+
+PROCESSORS = {
+    "list": process_file,
+    "batch": process_file_batch,
+    "stream": process_file_streaming,
+}
 
 
-def main():
+def main(mode="list", workers=None, checkpoint="checkpoint.json"):
     input_files = ["input01.txt", "input02.txt", "input03.txt"]
     output_lines = []
-    for filename in input_files:
-        message, result = process_file(filename)
+    if mode == "parallel":
+        results = process_files_parallel(input_files, workers)
+    elif mode == "incremental":
+        results = process_files_incremental(input_files, checkpoint)
+    else:
+        results = map(PROCESSORS[mode], input_files)
+    for message, result in results:
         output_lines.append(message)
         if result:
             print(message.strip())
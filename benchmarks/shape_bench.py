@@ -0,0 +1,187 @@
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SHAPES_PATH = os.path.join(ROOT, "Hw-OOP", "oop1.3.1.py")
+FIGURES_PATH = os.path.join(ROOT, "Hw-OOP №3", "oop.3.3.1.py")
+
+SHAPE_ARITY = {"Triangle": 3, "Rectangle": 2, "Trapeze": 4, "Parallelogram": 3, "Circle": 1}
+FIGURE_ARITY = {
+    "Triangle": 3, "Rectangle": 2, "Trapeze": 4, "Parallelogram": 3, "Circle": 1, "Ball": 1,
+    "TriangularPyramid": 2, "QuadrangularPyramid": 3, "RectangularParallelepiped": 3,
+    "Cone": 2, "TriangularPrism": 4,
+}
+INVALID_KINDS = ("unknown", "arity", "number", "negative")
+
+
+def load_module(path, name):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def generate_lines(arity, count, invalid=0.1, mix=None, seed=0):
+    rng = random.Random(seed)
+    names = list(mix or arity)
+    weights = [mix[name] for name in names] if mix else None
+    lines = []
+    for _ in range(count):
+        name = rng.choices(names, weights)[0]
+        params = [str(rng.randint(1, 25)) for _ in range(arity[name])]
+        if rng.random() < invalid:
+            kind = rng.choice(INVALID_KINDS)
+            if kind == "unknown":
+                name = "Hexagon"
+            elif kind == "arity":
+                params.append(str(rng.randint(1, 25)))
+            elif kind == "number":
+                params[0] = "x" + params[0]
+            else:
+                params[0] = "-" + params[0]
+        lines.append(f"{name:>30} " + " ".join(f"{p:>4}" for p in params) + " \n")
+    return lines
+
+
+def timed(function, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def bench_shapes(module, lines, path, repeat):
+    results = {}
+    results["parse"], shapes = timed(lambda: [s for s in map(module.create_shape, lines) if s], repeat)
+
+    def compute():
+        for shape in shapes:
+            shape.reset_metrics()
+            shape.area()
+            shape.perimeter()
+    results["compute"], _ = timed(compute, repeat)
+
+    def reduce():
+        reducer = module.ShapeReducer()
+        for shape in shapes:
+            reducer.add(shape)
+        return reducer
+    results["reduce"], reducer = timed(reduce, repeat)
+    results["write"], _ = timed(lambda: io.StringIO().writelines([module.result_message(path, reducer.shape, reducer.count)[0]]), repeat)
+    results["process_file"], _ = timed(lambda: module.process_file(path, cache=None), repeat)
+    results["process_file_cached"], _ = timed(lambda: module.process_file(path, cache=module.MetricCache()), repeat)
+    results["process_file_streaming"], _ = timed(lambda: module.process_file_streaming(path), repeat)
+    if module.np is not None:
+        results["process_file_batch"], _ = timed(lambda: module.process_file_batch(path), repeat)
+    return results
+
+
+def bench_figures(module, lines, path, repeat):
+    results = {}
+
+    def parse():
+        figures = []
+        errors = Counter()
+        for line in lines:
+            figure, _ = module.parse_figure(line, path, errors)
+            if figure:
+                figures.append(figure)
+        return figures
+    results["parse"], figures = timed(parse, repeat)
+
+    def compute():
+        for figure in figures:
+            figure.reset_metrics()
+            figure.volume()
+    results["compute"], _ = timed(compute, repeat)
+    results["reduce"], max_figure = timed(lambda: module.find_max_figure(figures), repeat)
+    if module.np is not None:
+        results["reduce_batch"], _ = timed(lambda: module.find_max_figure_batch(figures), repeat)
+    results["write"], _ = timed(lambda: module.write_figure_info(max_figure, io.StringIO()), repeat)
+    output = os.path.join(os.path.dirname(path), "figures_output.txt")
+    with contextlib.redirect_stdout(io.StringIO()):
+        results["process_files"], _ = timed(
+            lambda: module.process_files([path], output, reader=lambda file: module.read_figures(file, cache=None)), repeat)
+
+        def process_files_cached():
+            cache = module.MetricCache()
+            return module.process_files([path], output, reader=lambda file: module.read_figures(file, cache=cache))
+        results["process_files_cached"], _ = timed(process_files_cached, repeat)
+    return results
+
+
+def compare(current, baseline):
+    for group, timings in current["results"].items():
+        for phase, seconds in timings.items():
+            old = baseline.get("results", {}).get(group, {}).get(phase)
+            if old:
+                print(f"{group:>10} {phase:<24} {old:10.4f}s -> {seconds:10.4f}s  x{old / seconds:.2f}")
+
+
+def parse_mix(text):
+    if not text:
+        return None
+    mix = {}
+    for item in text.split(","):
+        name, _, weight = item.partition("=")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the oop1.3.1 and oop.3.3.1 shape pipelines")
+    parser.add_argument("--lines", type=int, default=200000)
+    parser.add_argument("--invalid", type=float, default=0.1)
+    parser.add_argument("--mix", help="comma-separated Name=weight pairs, e.g. Circle=3,Ball=1")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--compare", help="previous results JSON to compare against")
+    args = parser.parse_args(argv)
+
+    shapes = load_module(SHAPES_PATH, "oop131")
+    figures = load_module(FIGURES_PATH, "oop331")
+    report = {
+        "config": {"lines": args.lines, "invalid": args.invalid, "mix": args.mix, "seed": args.seed,
+                   "repeat": args.repeat},
+        "python": platform.python_version(),
+        "results": {},
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        for key, module, arity, bench in (("oop1.3.1", shapes, SHAPE_ARITY, bench_shapes),
+                                          ("oop.3.3.1", figures, FIGURE_ARITY, bench_figures)):
+            mix = parse_mix(args.mix)
+            if mix:
+                mix = {name: weight for name, weight in mix.items() if name in arity} or None
+            lines = generate_lines(arity, args.lines, args.invalid, mix, args.seed)
+            path = os.path.join(directory, f"{key}.txt")
+            with open(path, "w") as file:
+                file.writelines(lines)
+            report["results"][key] = bench(module, lines, path, args.repeat)
+
+    with open(args.output, "w") as file:
+        json.dump(report, file, indent=2)
+    for group, timings in report["results"].items():
+        for phase, seconds in timings.items():
+            print(f"{group:>10} {phase:<24} {seconds:10.4f}s")
+    if args.compare:
+        with open(args.compare) as file:
+            compare(report, json.load(file))
+
+
+if __name__ == "__main__":
+    main()